@@ -2,8 +2,9 @@ import sys
 import os
 import argparse
 import asyncio
-import toml
+import time
 from arbies.manager import Manager
+from arbies.plan import PlanError, compile_plan, load_plan, save_plan
 
 
 async def main() -> int:
@@ -13,28 +14,89 @@ async def main() -> int:
     command_parser = parser.add_subparsers(dest='command')
     command_parser.required = True
 
-    command_parser.add_parser('once')
-    command_parser.add_parser('loop')
+    for command in ('once', 'loop'):
+        run_parser = command_parser.add_parser(command)
+        run_parser.add_argument('--no-cache', action='store_true', help='Compile the config rather than use its plan')
+
+    command_parser.add_parser('compile')
+
+    batch_parser = command_parser.add_parser('batch')
+    batch_parser.add_argument('configs', nargs='+', help='Config files, directories of them, or globs')
+    batch_parser.add_argument('-j', '--jobs', type=int, default=None)
 
     args = parser.parse_args()
 
+    if args.command == 'batch':
+        return await _batch(args.configs, args.jobs)
+
     config_path = os.path.expanduser(args.config)
 
     if not os.path.isfile(config_path):
         print(f'Could not find configuration file "{config_path}".')
         return 1
 
-    manager = _get_manager(config_path)
+    if args.command == 'compile':
+        return _compile(config_path)
+
+    try:
+        manager = _get_manager(config_path, args.no_cache)
+    except PlanError as e:
+        print(e)
+        return 1
+
+    if args.command == 'loop':
+        if manager.config.get('Global', {}).get('WatchConfig', True):
+            manager.watch_config(config_path)
+        render_task = await manager.render_loop()
+    else:
+        render_task = await manager.render_once()
 
-    await manager.render_loop() if args.command == 'loop' else manager.render_once()
+    try:
+        await render_task
+    except asyncio.CancelledError:
+        # Shutting down cancels the render task, including when it shuts itself down.
+        pass
     await manager.shutdown()
 
     return 0
 
 
-def _get_manager(config_path) -> Manager | None:
-    with open(config_path, 'r') as config_file:
-        return Manager(**toml.load(config_file))
+async def _batch(patterns: list[str], jobs: int | None) -> int:
+    from arbies.batch import find_configs, format_summary, render_batch
+
+    paths = find_configs(patterns)
+
+    if len(paths) == 0:
+        print(f'Could not find any configuration files in {", ".join(patterns)}.')
+        return 1
+
+    start = time.monotonic()
+    results = await asyncio.to_thread(render_batch, paths, jobs)
+    print(format_summary(results, time.monotonic() - start))
+
+    return 0 if all(result.error is None for result in results) else 1
+
+
+def _compile(config_path: str) -> int:
+    start = time.monotonic()
+
+    try:
+        plan = compile_plan(config_path)
+    except PlanError as e:
+        print(e)
+        return 1
+
+    save_plan(config_path, plan)
+    print(f'Compiled {config_path} in {time.monotonic() - start:.3f} seconds.')
+
+    return 0
+
+
+def _get_manager(config_path: str, no_cache: bool = False) -> Manager | None:
+    plan = compile_plan(config_path) if no_cache else load_plan(config_path)
+    return Manager(plan=plan)
 
 
-sys.exit(asyncio.run(main()))
+# Guarded, as process pool workers may import this module.
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -1,6 +1,8 @@
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Any
+import random
+import time
+from typing import Any, Awaitable, Callable
 
 
 class ContextLock:
@@ -23,3 +25,51 @@ class ContextLock:
             yield lock
         finally:
             lock.release()
+
+
+class CircuitOpenError(IOError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, base_delay: float = 30.0, max_delay: float = 30.0 * 60.0, jitter: float = 0.25):
+        self.name: str = name
+        self._base_delay: float = base_delay
+        self._max_delay: float = max_delay
+        self._jitter: float = jitter
+
+        self._failures: int = 0
+        self._retry_at: float = 0.0
+        self._probing: bool = False
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def is_open(self) -> bool:
+        return self._failures > 0 and (self._probing or time.monotonic() < self._retry_at)
+
+    async def call[T](self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        if self.is_open:
+            raise CircuitOpenError(f'{self.name} is backing off after {self._failures} failures, '
+                                   f'retrying in {max(0.0, self._retry_at - time.monotonic()):.0f} seconds')
+
+        # Once the backoff expires, a single call goes through to probe the service while everything else still fails
+        # fast.
+        self._probing = self._failures > 0
+
+        try:
+            result: T = await func(*args, **kwargs)
+        except Exception:
+            self._failures += 1
+            delay: float = min(self._max_delay, self._base_delay * 2 ** (self._failures - 1))
+            # Jitter keeps everything that failed together from retrying in lockstep.
+            delay *= 1.0 + random.uniform(-self._jitter, self._jitter)
+            self._retry_at = time.monotonic() + delay
+            raise
+        else:
+            self._failures = 0
+            return result
+        finally:
+            self._probing = False
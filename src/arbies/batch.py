@@ -0,0 +1,100 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import glob
+import multiprocessing
+import os
+import time
+import traceback
+from typing import Any, ContextManager, Hashable, MutableMapping
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    path: str
+    elapsed: float
+    error: str | None = None
+
+
+def find_configs(patterns: list[str]) -> list[str]:
+    paths: list[str] = []
+
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.toml')
+        paths.extend(sorted(path for path in glob.glob(pattern) if os.path.isfile(path)))
+
+    # Keep the order given, but render each config once.
+    return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+
+def render_batch(paths: list[str], jobs: int | None = None) -> list[BatchResult]:
+    # Suppliers in every process share what they fetch through the parent's cache. Fonts and icons are pooled per
+    # process, and the processes are reused across configs, so each is loaded at most once per process.
+    with multiprocessing.Manager() as sync_manager:
+        shared_cache = sync_manager.dict()
+        shared_lock = sync_manager.Lock()
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_process,
+                                 initargs=(shared_cache, shared_lock)) as executor:
+            return list(executor.map(_render_config, paths))
+
+
+def format_summary(results: list[BatchResult], elapsed: float) -> str:
+    failures: list[BatchResult] = [result for result in results if result.error is not None]
+    render_times: list[float] = [result.elapsed for result in results]
+
+    lines: list[str] = [f'Rendered {len(results) - len(failures)} of {len(results)} configs in {elapsed:.2f} seconds '
+                        f'({len(results) / elapsed if elapsed > 0 else 0.0:.2f} configs/second)']
+    if len(render_times) > 0:
+        lines.append(f'Per config: {sum(render_times) / len(render_times):.3f} seconds mean, '
+                     f'{max(render_times):.3f} seconds max')
+    for failure in failures:
+        lines.append(f'Failed {failure.path}:\n{failure.error}')
+
+    return '\n'.join(lines)
+
+
+def _init_process(shared_cache: MutableMapping[Hashable, tuple[float, Any]], shared_lock: ContextManager):
+    from arbies.suppliers import set_shared_cache
+
+    set_shared_cache(shared_cache, shared_lock)
+
+
+def _render_config(path: str) -> BatchResult:
+    start: float = time.monotonic()
+    _reset_process()
+
+    try:
+        asyncio.run(_render_once(path))
+    except Exception:
+        return BatchResult(path, time.monotonic() - start, traceback.format_exc())
+
+    return BatchResult(path, time.monotonic() - start)
+
+
+def _reset_process():
+    # Pool processes render one config after another, so whatever a config registers process wide is forgotten
+    # before the next. The pooled fonts and icons are kept, as they only depend on their files.
+    from arbies import logutil
+    from arbies.drawing.font import Font
+    from arbies.workers.text import TextWorker
+
+    Font.clear_registered()
+    TextWorker.clear_parsed()
+    logutil.clear_handlers()
+
+
+async def _render_once(path: str):
+    from arbies.manager import Manager
+    from arbies.plan import load_plan
+
+    manager = Manager(plan=load_plan(path))
+
+    try:
+        await (await manager.render_once())
+    except asyncio.CancelledError:
+        # Shutting down cancels the render task, including when it shuts itself down.
+        pass
@@ -56,7 +56,12 @@ def draw_image(dest: Image.Image,
         x += offset[0]
         y += offset[1]
 
-    dest.paste(source, (int(x), int(y)))
+    # Without an alpha band on the destination, the source's transparency has to be applied as a mask instead.
+    mask: Image.Image | None = None
+    if 'A' not in dest.getbands() and 'A' in source.getbands():
+        mask = source.getchannel('A')
+
+    dest.paste(source, (int(x), int(y)), mask)
 
 
 def as_color(value: ColorType) -> ColorType:
@@ -67,3 +72,22 @@ def as_color(value: ColorType) -> ColorType:
     elif isinstance(value, str):
         return ImageColor.getrgb(value)
     raise ValueError(value)
+
+
+def as_mode_color(value: ColorType, mode: str) -> ColorType:
+    color = as_color(value)
+
+    if mode in ('RGB', 'RGBA'):
+        return color
+
+    # Same weights ImageColor.getcolor uses for greyscale.
+    luminance: int = (color[0] * 299 + color[1] * 587 + color[2] * 114) // 1000
+    alpha: int = color[3] if len(color) == 4 else 255
+
+    if mode == 'LA':
+        return luminance, alpha
+    elif mode == 'L':
+        return luminance
+    elif mode == '1':
+        return 255 if luminance >= 128 else 0
+    raise ValueError(mode)
@@ -3,7 +3,7 @@ from enum import Enum
 
 
 type Vector2Type = tuple[float, float]
-type ColorType = str | tuple[int, int, int] | tuple[int, int, int, int]
+type ColorType = str | int | tuple[int, int] | tuple[int, int, int] | tuple[int, int, int, int]
 
 
 class _ConvertFromEnumMixin:
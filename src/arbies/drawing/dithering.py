@@ -1,9 +1,13 @@
 # Adapted from work by sloum. https://tildegit.org/sloum/lid
 
-from PIL import Image, PyAccess
-from typing import Callable
+from PIL import Image, ImageChops, ImageStat
+from arbies.drawing.geometry import Box
+from typing import TYPE_CHECKING, Callable
 
-_PixelsType = PyAccess.PyAccess
+if TYPE_CHECKING:
+    from PIL import PyAccess
+
+_PixelsType = 'PyAccess.PyAccess'
 _KernelType = Callable[[_PixelsType, _PixelsType, int, int], None]
 
 
@@ -55,10 +59,14 @@ def ordered_dither_9(source: Image.Image) -> Image.Image:
     return _run_kernel(source, kernel)
 
 
+def get_threshold(source: Image.Image) -> int:
+    # The mean brightness, which threshold dithering splits at unless given a threshold.
+    return int(ImageStat.Stat(source.convert('L')).mean[0])
+
+
 def threshold_dither(source: Image.Image, threshold: int | None = None) -> Image.Image:
     if threshold is None:
-        pixels = list(source.convert('L').getdata())
-        threshold = sum(pixels) // len(pixels)
+        threshold = get_threshold(source)
 
     def kernel(src: _PixelsType, dest: _PixelsType, col: int, row: int):
         dest[col, row] = int(src[col, row] > threshold)
@@ -94,3 +102,105 @@ def error_diffusion_dither(source: Image.Image) -> Image.Image:
         dest[col, row] = int(res)
 
     return _run_kernel(source, kernel)
+
+
+_methods: dict[str, Callable[[Image.Image], Image.Image]] = {
+    'ordered4': ordered_dither_4,
+    'ordered9': ordered_dither_9,
+    'threshold': threshold_dither,
+    'random': random_dither,
+    'errordiffusion': error_diffusion_dither,
+}
+
+
+def get(name: str) -> Callable[[Image.Image], Image.Image] | None:
+    return _methods.get(name.lower(), None)
+
+
+def quantize_levels(source: Image.Image, levels: int, dither: bool = True) -> Image.Image:
+    palette: list[int] = []
+    for i in range(levels):
+        value = round(i * 255 / (levels - 1))
+        palette += [value, value, value]
+
+    palette_image = Image.new('P', (1, 1))
+    palette_image.putpalette(palette)
+
+    quantized = source.convert('RGB').quantize(palette=palette_image,
+                                               dither=Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE)
+    return quantized.convert('L')
+
+
+class Quantizer:
+    # Ordered dither patterns repeat every 2 or 3 pixels, so regions are aligned to keep them in phase with the
+    # rest of the frame.
+    _region_alignment: int = 6
+    # Methods where each pixel's result depends only on its own value and position, so changed regions can be
+    # dithered alone. Error diffusion carries error across the whole frame, so it is always dithered whole.
+    _region_methods: tuple[str, ...] = ('ordered4', 'ordered9', 'threshold', 'random')
+
+    def __init__(self, method: str | None = None, levels: int | None = None):
+        if method is not None and method.lower() != 'none' and get(method) is None:
+            raise ValueError(f'Unknown dither method "{method}"')
+
+        self.method: str | None = method if method is None or method.lower() != 'none' else None
+        self.levels: int = levels or 2
+
+        if not 2 <= self.levels <= 256:
+            raise ValueError(f'Quantization levels must be between 2 and 256, not {self.levels}')
+
+        self._image: Image.Image | None = None
+        # Threshold dithering splits the whole frame at its mean, rather than each region at its own.
+        self._threshold: int | None = None
+
+    @property
+    def reuses_regions(self) -> bool:
+        if self.levels == 2:
+            return self.method is None or self.method.lower() in self._region_methods
+        # Dithering to more levels diffuses error, like error diffusion does.
+        return self.method is None
+
+    def apply(self, source: Image.Image, boxes: list[Box] | None = None) -> tuple[Image.Image, list[Box] | None]:
+        # Returns the quantized frame and the boxes it changed in, which for methods that dither the whole frame can
+        # reach beyond the boxes the source changed in.
+        previous: Image.Image | None = self._image
+        if previous is not None and previous.size != source.size:
+            previous = None
+
+        threshold: int | None = None
+        if self.levels == 2 and self.method is not None and self.method.lower() == 'threshold':
+            threshold = get_threshold(source)
+
+        if previous is None or boxes is None or not self.reuses_regions or threshold != self._threshold:
+            self._threshold = threshold
+            self._image = self._quantize(source)
+            if previous is None or boxes is None:
+                return self._image, None
+
+            changed: tuple[int, int, int, int] | None = ImageChops.difference(previous.convert('L'),
+                                                                              self._image.convert('L')).getbbox()
+            return self._image, [Box(*changed)] if changed is not None else []
+
+        for box in boxes:
+            region = self._align(box, source.size)
+            if region[0] >= region[2] or region[1] >= region[3]:
+                continue
+            self._image.paste(self._quantize(source.crop(region)), region[:2])
+
+        return self._image, boxes
+
+    def _quantize(self, source: Image.Image) -> Image.Image:
+        if self.levels == 2:
+            if self.method is None:
+                return source.convert('L').convert('1', dither=Image.Dither.NONE)
+            if self.method.lower() == 'threshold':
+                return threshold_dither(source, self._threshold)
+            return get(self.method)(source)
+        return quantize_levels(source, self.levels, dither=self.method is not None)
+
+    def _align(self, box: tuple[int, int, int, int], size: tuple[int, int]) -> tuple[int, int, int, int]:
+        align = self._region_alignment
+        return (max(0, int(box[0] // align * align)),
+                max(0, int(box[1] // align * align)),
+                min(size[0], int(-(-box[2] // align) * align)),
+                min(size[1], int(-(-box[3] // align) * align)))
@@ -1,6 +1,8 @@
 from __future__ import annotations
+from collections import OrderedDict
+from functools import cached_property
 import os
-from PIL import ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
 from arbies.drawing import Vector2Type, ColorType, HorizontalAlignment, VerticalAlignment, get_aligned_position
 from arbies.manager import ConfigDict
 
@@ -10,20 +12,109 @@ class Font(ImageFont.FreeTypeFont):
                                                       '../../../resources/fonts/RobotoCondensed-Regular.ttf'))
     _default_size: int = 14
     _default_line_height: float = 1.2
-
-    def __init__(self, path: str | bytes, size: int = _default_size, line_height: float = _default_line_height):
-        super().__init__(font=path, size=size)
+    # Strings up to this long are drawn from cached glyphs, rather than laid out and rasterized every time.
+    sprite_max_length: int = 16
+    _string_mask_cache_size: int = 256
+
+    def __init__(self, path: str, size: int = _default_size, line_height: float = _default_line_height):
+        super().__init__(font=_FontData(_get_font_data(path)), size=size)
+        # FreeTypeFont keeps whatever it was opened from as its path. Keep the real one, so variants and pickling work.
+        self.path: str = path
         self.line_height: float = line_height
 
+        # Keyed by font mode first, as images without antialiasing get their text rasterized without it too.
+        self._glyph_masks: dict[tuple[str, str], tuple[Image.Image, int, int]] = {}
+        self._advances: dict[tuple[str, str, str], float] = {}
+        self._string_masks: OrderedDict[tuple[str, str], tuple[Image.Image, int, int]] = OrderedDict()
+
+    def __reduce__(self):
+        return Font.get, (self.path, self.size, self.line_height)
+
+    @classmethod
+    def get(cls, path: str, size: int = _default_size, line_height: float = _default_line_height) -> Font:
+        key = (path, size, line_height)
+        if key not in _font_pool:
+            _font_pool[key] = Font(path, size=size, line_height=line_height)
+        return _font_pool[key]
+
+    @cached_property
+    def scaled_line_height(self) -> float:
+        return self.getmetrics()[0] * self.line_height
+
+    def get_string_mask(self, text: str, font_mode: str = 'L') -> tuple[Image.Image, int, int]:
+        # Returns a mask of the text, and its offset from where it is drawn, composed from glyphs rasterized once each.
+        key = (font_mode, text)
+        if key in self._string_masks:
+            self._string_masks.move_to_end(key)
+            return self._string_masks[key]
+
+        glyphs: list[tuple[Image.Image, int, int]] = []
+        pen: float = 0.0
+        for i, char in enumerate(text):
+            mask, x, y = self._get_glyph_mask(char, font_mode)
+            glyphs.append((mask, round(pen) + x, y))
+            if i + 1 < len(text):
+                pen += self._get_advance(char, text[i + 1], font_mode)
+
+        glyphs = [glyph for glyph in glyphs if glyph[0].width > 0 and glyph[0].height > 0]
+        if len(glyphs) == 0:
+            string_mask = (Image.new('L', (0, 0)), 0, 0)
+        else:
+            left, top = min(x for _, x, _ in glyphs), min(y for _, _, y in glyphs)
+            right, bottom = max(x + mask.width for mask, x, _ in glyphs), max(y + mask.height for mask, _, y in glyphs)
+            image = Image.new('L', (right - left, bottom - top))
+
+            for mask, x, y in glyphs:
+                box = (x - left, y - top, x - left + mask.width, y - top + mask.height)
+                # Kerned glyphs can overlap, where pasting one over the other would cut into it.
+                image.paste(ImageChops.lighter(image.crop(box), mask), box)
+
+            string_mask = (image, left, top)
+
+        self._string_masks[key] = string_mask
+        if len(self._string_masks) > self._string_mask_cache_size:
+            self._string_masks.popitem(last=False)
+
+        return string_mask
+
+    def _get_glyph_mask(self, char: str, font_mode: str) -> tuple[Image.Image, int, int]:
+        key = (font_mode, char)
+        if key not in self._glyph_masks:
+            left, top, right, bottom = self.getbbox(char, mode=font_mode)
+            mask = Image.new('L', (max(0, right - left), max(0, bottom - top)))
+
+            if mask.width > 0 and mask.height > 0:
+                draw = ImageDraw.Draw(mask)
+                draw.fontmode = font_mode
+                draw.text((-left, -top), char, font=self, fill=255)
+                del draw
+
+            self._glyph_masks[key] = (mask, left, top)
+        return self._glyph_masks[key]
+
+    def _get_advance(self, char: str, next_char: str, font_mode: str) -> float:
+        # How far the pen moves past char when next_char follows, kerning included. Mono text is hinted differently,
+        # so advances differ by mode too.
+        key = (font_mode, char, next_char)
+        if key not in self._advances:
+            self._advances[key] = self.getlength(char + next_char, mode=font_mode) - \
+                self.getlength(next_char, mode=font_mode)
+        return self._advances[key]
+
     def with_size(self, size: int) -> Font:
         if size == self.size:
             return self
-        return Font(self.path, size=size, line_height=self.line_height)
+        return Font.get(self.path, size=size, line_height=self.line_height)
 
     @classmethod
     def load_from_config(cls, name: str, config: ConfigDict) -> Font:
-        global _default_font
+        font = Font.from_config(name, config)
+        Font.register(name, font)
+
+        return font
 
+    @classmethod
+    def from_config(cls, name: str, config: ConfigDict) -> Font:
         path = config.get('Path', Font._default_path)
         size = config.get('Size', Font._default_size)
         line_height = config.get('LineHeight', Font._default_line_height)
@@ -31,22 +122,69 @@ class Font(ImageFont.FreeTypeFont):
         if name is None or len(name) == 0:
             raise ValueError(f'Font name is either not defined or is blank.')
 
+        if path is not None:
+            path = Font.resolve_path(path)
         if path is None or not os.path.isfile(path):
             raise ValueError(f'Font path "{path}" can not be found.')
 
-        font = Font(path, size=size, line_height=line_height)
+        return Font.get(path, size=size, line_height=line_height)
+
+    @staticmethod
+    def resolve_path(path: str) -> str:
+        # Expanded and made absolute, so the same file is always cached, and planned, under the same path.
+        return os.path.abspath(os.path.expanduser(os.path.expandvars(path)))
+
+    @classmethod
+    def register(cls, name: str, font: Font):
+        global _default_font
+
         _font_cache[name] = font
 
         if len(_font_cache) == 1:
             _default_font = font
 
-        return font
+    @classmethod
+    def get_registered(cls) -> dict[str, Font]:
+        return dict(_font_cache)
+
+    @classmethod
+    def set_registered(cls, fonts: dict[str, Font]):
+        # Replaces every named font at once, the first becoming the default as if registered in order.
+        Font.clear_registered()
+        for name, font in fonts.items():
+            Font.register(name, font)
+
+    @classmethod
+    def clear_registered(cls):
+        # Forgets every named font and the default, so the next config's fonts don't resolve to an earlier one's.
+        global _default_font
+
+        _font_cache.clear()
+        _default_font = None
 
 
 type FontType = ImageFont.ImageFont | ImageFont.FreeTypeFont | Font
 
 _default_font: Font | None = None
 _font_cache: dict[str, Font] = {}
+_font_pool: dict[tuple[str, int, float], Font] = {}
+_font_data_cache: dict[str, bytes] = {}
+
+
+class _FontData:
+    # FreeTypeFont reads file-like fonts into memory, so every size of a font can be opened from one read of the file.
+    def __init__(self, data: bytes):
+        self._data: bytes = data
+
+    def read(self) -> bytes:
+        return self._data
+
+
+def _get_font_data(path: str) -> bytes:
+    if path not in _font_data_cache:
+        with open(path, 'rb') as font_file:
+            _font_data_cache[path] = font_file.read()
+    return _font_data_cache[path]
 
 
 def _get_default_font() -> Font:
@@ -54,7 +192,7 @@ def _get_default_font() -> Font:
 
     if _default_font is None:
         # noinspection PyProtectedMember
-        _default_font = Font(Font._default_path)
+        _default_font = Font.get(Font._default_path)
 
     return _default_font
 
@@ -77,7 +215,7 @@ def get_font(name: str | None = None, size: int | None = None) -> Font:
 
 def get_line_height(font: FontType) -> float:
     if isinstance(font, Font):
-        return font.getmetrics()[0] * font.line_height
+        return font.scaled_line_height
     elif isinstance(font, ImageFont.FreeTypeFont):
         # noinspection PyProtectedMember
         return font.getmetrics()[0] * Font._default_line_height
@@ -90,6 +228,21 @@ def get_text_size(font: FontType, text: str) -> Vector2Type:
     return font.getbbox(text)[2:]
 
 
+def draw_text(draw: ImageDraw.ImageDraw, xy: Vector2Type, text: str, font: FontType, fill: ColorType):
+    # Short single lines, like clocks and readings, are drawn from cached glyphs, so redrawing them skips FreeType.
+    # Glyphs are cached at whole pixel positions, so text is snapped to the nearest pixel either way, and looks the
+    # same whichever way it is drawn.
+    xy = (round(xy[0]), round(xy[1]))
+
+    if not isinstance(font, Font) or len(text) > font.sprite_max_length or '\n' in text:
+        draw.text(xy, text, font=font, fill=fill)
+        return
+
+    mask, x, y = font.get_string_mask(text, draw.fontmode)
+    if mask.width > 0 and mask.height > 0:
+        draw.bitmap((xy[0] + x, xy[1] + y), mask, fill=fill)
+
+
 def aligned_text(draw: ImageDraw.ImageDraw,
                  font: FontType,
                  text: str,
@@ -105,7 +258,7 @@ def aligned_text(draw: ImageDraw.ImageDraw,
         x += offset[0]
         y += offset[1]
 
-    draw.text((x, y), text, font=font, fill=fill)
+    draw_text(draw, (x, y), text, font, fill)
 
 
 def aligned_wrapped_text(draw: ImageDraw.ImageDraw,
@@ -177,6 +330,6 @@ def aligned_wrapped_text(draw: ImageDraw.ImageDraw,
 
         x, _ = get_aligned_position(size, area, horizontal_alignment, VerticalAlignment.TOP)
 
-        draw.text((x, y), text, font=font, fill=fill)
+        draw_text(draw, (x, y), text, font, fill)
 
         y += line_height
@@ -1,2 +1,2 @@
 from .vector import Vector2, Vector4
-from .box import Box
+from .box import Box, union_all, intersect_all, scale_all, merge_overlapping
@@ -1,19 +1,83 @@
 from __future__ import annotations
+from typing import Iterable
 from .vector import Vector4
 
 
 class Box(Vector4):
+    __slots__ = ()
+
     def __init__(self, x: int = 0, y: int = 0, w: int = 0, z: int = 0):
         super().__init__(x, y, w, z)
 
     @property
     def width(self) -> int:
-        return abs(self.w - self.x)
+        return abs(self[2] - self[0])
 
     @property
     def height(self) -> int:
-        return abs(self.z - self.y)
+        return abs(self[3] - self[1])
+
+    @property
+    def area(self) -> int:
+        return self.width * self.height
 
     def intersects(self, other: Box) -> bool:
-        return not (self.w < other.x or other.w < self.x or
-                    self.z < other.y or other.z < self.y)
+        return not (self[2] < other[0] or other[2] < self[0] or
+                    self[3] < other[1] or other[3] < self[1])
+
+    def overlaps(self, other: Box) -> bool:
+        # Unlike intersects, boxes that only share an edge do not overlap.
+        return self[0] < other[2] and other[0] < self[2] and self[1] < other[3] and other[1] < self[3]
+
+    def contains(self, other: Box) -> bool:
+        return self[0] <= other[0] and self[1] <= other[1] and other[2] <= self[2] and other[3] <= self[3]
+
+    def union(self, other: Box) -> Box:
+        return Box(min(self[0], other[0]), min(self[1], other[1]), max(self[2], other[2]), max(self[3], other[3]))
+
+    def intersection(self, other: Box) -> Box | None:
+        x, y, w, z = max(self[0], other[0]), max(self[1], other[1]), min(self[2], other[2]), min(self[3], other[3])
+        if x >= w or y >= z:
+            return None
+        return Box(x, y, w, z)
+
+    def scaled(self, x_scale: float, y_scale: float) -> Box:
+        return Box(self[0] * x_scale, self[1] * y_scale, self[2] * x_scale, self[3] * y_scale)
+
+
+def union_all(boxes: Iterable[Box]) -> Box | None:
+    boxes = list(boxes)
+    if len(boxes) == 0:
+        return None
+    return Box(min(box[0] for box in boxes), min(box[1] for box in boxes),
+               max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def intersect_all(boxes: Iterable[Box], bounds: Box) -> list[Box]:
+    clipped: list[Box] = []
+    for box in boxes:
+        intersection = bounds.intersection(box)
+        if intersection is not None:
+            clipped.append(intersection)
+    return clipped
+
+
+def scale_all(boxes: Iterable[Box], x_scale: float, y_scale: float) -> list[Box]:
+    return [Box(box[0] * x_scale, box[1] * y_scale, box[2] * x_scale, box[3] * y_scale) for box in boxes]
+
+
+def merge_overlapping(boxes: Iterable[Box]) -> list[Box]:
+    merged: list[Box] = []
+
+    for box in boxes:
+        # Growing a box can make it overlap ones that were merged earlier, so keep folding until it is stable.
+        i = 0
+        while i < len(merged):
+            if merged[i].overlaps(box):
+                box = merged.pop(i).union(box)
+                i = 0
+            else:
+                i += 1
+        merged.append(box)
+
+    return merged
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Union
 
 
 class Vector2(tuple):
+    # No per-instance dict; the values live in the tuple itself.
+    __slots__ = ()
+
     def __init__(self, x: int | Vector2 = 0, y: int = 0):
         pass
 
@@ -25,6 +27,8 @@ class Vector2(tuple):
 
 
 class Vector4(tuple):
+    __slots__ = ()
+
     def __init__(self,
                  x: int | Vector2 | None = 0,
                  y: int = 0,
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from functools import reduce
+from typing import Iterable, Iterator
+from PIL import Image, ImageChops
+from arbies.drawing.geometry import Box
+
+
+def iter_tiles(bounds: Box, tile_size: int, within: Iterable[Box] | None = None) -> Iterator[Box]:
+    # Yields each tile of a tile_size grid over bounds, clipped to bounds, once. Given boxes to look within, only the
+    # tiles they overlap are yielded.
+    tiles: set[tuple[int, int]] = set()
+    areas: Iterable[Box] = [bounds] if within is None else within
+
+    for area in areas:
+        area = bounds.intersection(area)
+        if area is None:
+            continue
+
+        for row in range(int(area[1]) // tile_size, -(-int(area[3]) // tile_size)):
+            for column in range(int(area[0]) // tile_size, -(-int(area[2]) // tile_size)):
+                tiles.add((row, column))
+
+    for row, column in sorted(tiles):
+        tile = bounds.intersection(Box(column * tile_size,
+                                       row * tile_size,
+                                       (column + 1) * tile_size,
+                                       (row + 1) * tile_size))
+        if tile is not None:
+            yield tile
+
+
+def changed_tiles(before: Image.Image, after: Image.Image, bounds: Box, tile_size: int) -> list[Box]:
+    # Compares two crops of the same area, bounds, and returns the changed pixels' bounds within each tile of a
+    # tile_size grid over the whole canvas.
+    difference = ImageChops.difference(before, after)
+    # Any band changing counts, so the bands are folded into one mask. getbbox() on an RGBA difference would only
+    # look at its alpha.
+    mask: Image.Image = reduce(ImageChops.lighter, difference.split())
+
+    if mask.getbbox() is None:
+        return []
+
+    changed: list[Box] = []
+    x, y = int(bounds[0]), int(bounds[1])
+
+    for tile in iter_tiles(bounds, tile_size):
+        changed_box = mask.crop((tile[0] - x, tile[1] - y, tile[2] - x, tile[3] - y)).getbbox()
+        if changed_box is not None:
+            changed.append(Box(tile[0] + changed_box[0],
+                               tile[1] + changed_box[1],
+                               tile[0] + changed_box[2],
+                               tile[1] + changed_box[3]))
+
+    return changed
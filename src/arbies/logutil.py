@@ -0,0 +1,171 @@
+from __future__ import annotations
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import threading
+import time
+from typing import Callable, Hashable
+
+# Every record goes through one queue to a background thread, so formatting and writing them never holds up the
+# event loop.
+_queue: queue.SimpleQueue[logging.LogRecord | _FlushMarker] = queue.SimpleQueue()
+# Shared by everything in the process that logs to the same place, like several Managers logging to stdout, so no
+# line is written several times over. Keyed by whatever identifies that place, and closed once its last user
+# releases it.
+_handlers: dict[Hashable, logging.Handler] = {}
+_handler_users: dict[Hashable, int] = {}
+_listener: _Listener | None = None
+_listener_lock: threading.Lock = threading.Lock()
+
+
+class _FlushMarker:
+    # Queued behind the records to be written, and set once the listener reaches it.
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+
+
+class _Listener(QueueListener):
+    def handle(self, record: logging.LogRecord | _FlushMarker):
+        if isinstance(record, _FlushMarker):
+            record.done.set()
+            return
+        super().handle(record)
+
+
+class LazyQueueHandler(QueueHandler):
+    # QueueHandler formats each record before queueing it. Records are queued as they are instead, and formatted by
+    # the handlers on the listener's thread, so arguments must not change after they are logged.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    # Lets each distinct warning or error through once per interval, counting the repeats dropped in between and noting
+    # them on the next one let through. Messages are told apart before they are formatted, by their template and
+    # arguments. Routine messages below min_level, which repeat by design, always go through.
+    def __init__(self, interval: float = 60.0, min_level: int = logging.WARNING):
+        super().__init__()
+        self.interval: float = interval
+        self.min_level: int = min_level
+        self._seen: dict[tuple, tuple[float, int]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval <= 0 or (record.levelno < self.min_level and record.exc_info is None):
+            return True
+
+        try:
+            key = (record.name, record.levelno, record.msg, record.args)
+            hash(key)
+        except TypeError:
+            key = (record.name, record.levelno, record.msg)
+
+        now: float = time.monotonic()
+        with self._lock:
+            last_time, suppressed = self._seen.get(key, (None, 0))
+            if last_time is not None and now - last_time < self.interval:
+                self._seen[key] = (last_time, suppressed + 1)
+                return False
+
+            self._seen[key] = (now, 0)
+            if len(self._seen) > 1024:
+                # Forget messages that have gone quiet, so one-off messages don't pile up. Those with repeats still to
+                # be noted are kept.
+                self._seen = {key: value for key, value in self._seen.items()
+                              if now - value[0] < self.interval or value[1] > 0}
+
+        if suppressed > 0:
+            record.msg = f'{record.msg} ({suppressed} repeats suppressed)'
+        return True
+
+
+queue_handler: LazyQueueHandler = LazyQueueHandler(_queue)
+rate_limit_filter: RateLimitFilter = RateLimitFilter()
+queue_handler.addFilter(rate_limit_filter)
+
+
+def acquire_handler(key: Hashable, create: Callable[[], logging.Handler]) -> logging.Handler:
+    # Returns the handler for key, creating it on first use. Each acquire must be matched by a release_handler.
+    global _listener
+
+    with _listener_lock:
+        if key not in _handlers:
+            _handlers[key] = create()
+            _handler_users[key] = 0
+        _handler_users[key] += 1
+
+        if _listener is None:
+            _listener = _Listener(_queue, respect_handler_level=True)
+            _listener.handlers = tuple(_handlers.values())
+            _listener.start()
+        else:
+            _listener.handlers = tuple(_handlers.values())
+
+        return _handlers[key]
+
+
+def release_handler(key: Hashable):
+    # Writes out what is already queued first, as some of it may be meant for the handler.
+    flush()
+
+    with _listener_lock:
+        if key not in _handlers:
+            return
+
+        _handler_users[key] -= 1
+        if _handler_users[key] > 0:
+            return
+
+        del _handler_users[key]
+        handler: logging.Handler = _handlers.pop(key)
+        if _listener is not None:
+            _listener.handlers = tuple(_handlers.values())
+
+    handler.close()
+
+
+def clear_handlers():
+    # Closes every handler, however many users it has left.
+    flush()
+
+    with _listener_lock:
+        handlers: list[logging.Handler] = list(_handlers.values())
+        _handlers.clear()
+        _handler_users.clear()
+        if _listener is not None:
+            _listener.handlers = ()
+
+    for handler in handlers:
+        handler.close()
+
+
+def flush():
+    # Waits until everything queued so far is written, as processes that exit without running atexit handlers would
+    # otherwise lose it.
+    with _listener_lock:
+        listener: _Listener | None = _listener
+        if listener is not None:
+            marker = _FlushMarker()
+            _queue.put(marker)
+
+    if listener is not None:
+        marker.done.wait()
+
+    with _listener_lock:
+        handlers: list[logging.Handler] = list(_handlers.values())
+    for handler in handlers:
+        handler.flush()
+
+
+def _stop():
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+# Registered after logging's own, so it runs first and everything queued is written before the handlers close.
+atexit.register(_stop)
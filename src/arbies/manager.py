@@ -4,6 +4,9 @@ import os
 import asyncio
 from asyncio.exceptions import CancelledError
 from datetime import datetime
+import hashlib
+import json
+import time
 import logging
 from logging import StreamHandler
 from logging.handlers import RotatingFileHandler
@@ -13,107 +16,267 @@ from typing import TYPE_CHECKING, Type, Union
 if TYPE_CHECKING:
     from arbies.drawing.geometry import Vector2, Box
     from arbies.drawing import ColorType
+    from arbies.plan import Plan
+    from arbies.snapshot import SnapshotStore
     from arbies.suppliers import Supplier
     from arbies.trays import Tray
     from arbies.workers import Worker
 
 ConfigDict = dict[str, Union[str, int, float, list, 'ConfigDict']]
 
+_log_formatter = logging.Formatter('[%(asctime)s %(levelname)s] %(message)s')
+
 
 class Manager:
-    def __init__(self, **kwargs):
-        from arbies import trays, workers
-        from arbies.drawing import as_color
+    _canvas_modes: tuple[str, ...] = ('RGBA', 'LA', 'L', '1')
+
+    def __init__(self, plan: Plan | None = None, **kwargs):
+        from arbies.drawing import as_mode_color
         from arbies.drawing.font import Font
         from arbies.drawing.geometry import Vector2
 
+        # A compiled plan stands in for the config, with its types, fonts and text already resolved.
+        self._plan: Plan | None = plan
+        if plan is not None:
+            kwargs = plan.config
+
         global_config: ConfigDict = kwargs.get('Global', {})
 
         self._render_task: asyncio.Task | None = None
 
         # Rendering
         self._size: Vector2 = Vector2(global_config.get('Size', (640, 384)))
-        self._background_fill: ColorType = as_color(global_config.get('BackgroundFill', (255, 255, 255)))
+        self._canvas_mode: str = global_config.get('CanvasMode', 'RGBA')
+        if self._canvas_mode not in self._canvas_modes:
+            raise ValueError(f'Global.CanvasMode must be one of {", ".join(self._canvas_modes)}')
+        self._background_fill: ColorType = as_mode_color(global_config.get('BackgroundFill', (255, 255, 255)),
+                                                         self._canvas_mode)
         self._render_loop_interval: float = 15.0
+        self._render_ahead_time: float = float(global_config.get('RenderAheadTime', 5.0))
+        self._push_lock: asyncio.Lock = asyncio.Lock()
         self._image: Image.Image | None = None
+        # Updated areas are narrowed down to the pixels that changed, per tile of this size. 0 pushes whole areas.
+        self._damage_tile_size: int = int(global_config.get('DamageTileSize', 32))
+        # How long a worker may take to render before it is cancelled, unless it sets its own RenderTimeout.
+        self._render_timeout: float = float(global_config.get('RenderTimeout', 60.0))
+        # How long a once run waits for workers before pushing whatever has finished, and whether the workers still
+        # rendering then are pushed when they finish instead of being cancelled.
+        once_deadline = global_config.get('OnceDeadline', None)
+        self._once_deadline: float | None = float(once_deadline) if once_deadline is not None else None
+        self._late_push: bool = bool(global_config.get('LatePush', False))
 
         # Logging
+        from arbies import logutil
         self.log: logging.Logger = logging.getLogger('arbies')
-        self.log.setLevel(logging.DEBUG)
-        handler = StreamHandler(sys.stdout)
-        handler.setLevel(logging.DEBUG)
-        self.log.addHandler(handler)
-
-        self._log_formatter = logging.Formatter('[%(asctime)s %(levelname)s] %(message)s')
-        handler.setFormatter(self._log_formatter)
+        self.log.setLevel(self._get_log_level('Global.LogLevel', global_config.get('LogLevel', 'DEBUG')))
+        # Levels for the Trays, Workers and Suppliers subsystems, overriding LogLevel.
+        for subsystem, level in global_config.get('LogLevels', {}).items():
+            self.get_log(subsystem).setLevel(self._get_log_level(f'Global.LogLevels.{subsystem}', level))
+        if logutil.queue_handler not in self.log.handlers:
+            self.log.addHandler(logutil.queue_handler)
+        # Seconds during which a repeated warning or error, such as a worker failing on every update, is only logged
+        # once.
+        logutil.rate_limit_filter.interval = float(global_config.get('LogRateLimit', 60.0))
+        self._log_max_bytes: int = int(global_config.get('LogMaxBytes', 1024 * 1024))
+        self._log_backup_count: int = int(global_config.get('LogBackupCount', 3))
+        self._log_paths: list[str | None] = []
+        self._add_log_handler(None)
 
         log_path: str | None = global_config.get('LogPath', None)
         if log_path is not None:
-            handler = RotatingFileHandler(self.resolve_path(log_path), maxBytes=2048)
-            handler.setLevel(logging.DEBUG)
-            handler.setFormatter(self._log_formatter)
-            self.log.addHandler(handler)
+            self._add_log_handler(os.path.abspath(self.resolve_path(log_path)))
 
         # Fonts
-        for item_name, item_config in kwargs.get('Fonts', {}).items():
-            Font.load_from_config(item_name, item_config)
+        if plan is not None:
+            plan.install()
+        else:
+            for item_name, item_config in kwargs.get('Fonts', {}).items():
+                Font.load_from_config(item_name, item_config)
 
         # Suppliers
+        from arbies.asyncutil import ContextLock
         self.suppliers: set[Supplier] = set()
-        self._supplier_lock: asyncio.Lock = asyncio.Lock()
+        self._suppliers_by_type: dict[Type, Supplier] = {}
+        # Locked per type, so slow supplier startups don't hold each other up.
+        self._supplier_locks: ContextLock = ContextLock()
+
+        # Startup timing, from the start of rendering to the first frame reaching the trays.
+        self._start_time: float | None = None
+        self._first_pixel_time: float | None = None
 
         # Worker updating
         self._worker_update_lock: asyncio.Lock = asyncio.Lock()
         self._worker_images: dict[Worker, Image.Image | None] = {}
+        self._worker_opaque: dict[Worker, bool] = {}
         self._updated_workers: set[Worker] = set()
+        # Areas left behind by workers that were removed or moved, which need redrawing on the next update.
+        self._pending_boxes: list[Box] = []
+        self._worker_loops: dict[Worker, asyncio.Task] = {}
+
+        # Snapshots
+        snapshot_path: str | None = global_config.get('SnapshotPath', None)
+        self._snapshot_store: SnapshotStore | None = None
+        if snapshot_path is not None:
+            from arbies.snapshot import SnapshotStore
+            self._snapshot_store = SnapshotStore(self.resolve_path(snapshot_path))
+        self._snapshot_interval: float = float(global_config.get('SnapshotInterval', 5 * 60))
+        self._snapshot_time: float = time.monotonic()
+        self._restored_frame: Image.Image | None = None
+        self._restored_images: dict[Worker, Image.Image] = {}
+        # Whether the saved frame is still what the trays were last served. It is discarded before anything newer is
+        # pushed, so a restored frame can be trusted to be what an e-paper panel still shows.
+        self._snapshot_frame_saved: bool = self._snapshot_store is not None
+
+        # Config reloading
+        self._reload_lock: asyncio.Lock = asyncio.Lock()
+        # Held on to, so they can be cancelled on shutdown and their errors aren't lost.
+        self._reload_tasks: set[asyncio.Task] = set()
 
         # Trays and Workers
         self.config: ConfigDict = kwargs
-        self.trays: list[Tray] = []
-        self.workers: list[Worker] = []
+        self._named_trays: dict[str, Tray] = {}
+        self._named_workers: dict[str, Worker] = {}
+
+        for item_name, item_config in kwargs.get('Trays', {}).items():
+            self._named_trays[item_name] = self._create_item('Trays', item_name, item_config)
+        for item_name, item_config in kwargs.get('Workers', {}).items():
+            self._named_workers[item_name] = self._create_item('Workers', item_name, item_config)
+
+        self.trays: list[Tray] = list(self._named_trays.values())
+        self.workers: list[Worker] = list(self._named_workers.values())
+
+    def _add_log_handler(self, path: str | None):
+        # Shared through arbies.logutil with every other Manager in the process logging to the same path, or None for
+        # stdout.
+        from arbies import logutil
+
+        def create() -> logging.Handler:
+            if path is None:
+                handler = StreamHandler(sys.stdout)
+            else:
+                handler = RotatingFileHandler(path, maxBytes=self._log_max_bytes, backupCount=self._log_backup_count)
+            handler.setLevel(logging.DEBUG)
+            handler.setFormatter(_log_formatter)
+            return handler
+
+        if path not in self._log_paths:
+            self._log_paths.append(path)
+            logutil.acquire_handler(path, create)
+
+    def _remove_log_handlers(self):
+        from arbies import logutil
+
+        for path in self._log_paths:
+            logutil.release_handler(path)
+
+        self._log_paths.clear()
+
+    @staticmethod
+    def _get_log_level(key: str, name: str) -> int:
+        levels: dict[str, int] = logging.getLevelNamesMapping()
+        if str(name).upper() not in levels:
+            raise ValueError(f'{key} must be one of {", ".join(levels)}')
+        return levels[str(name).upper()]
 
-        for section_name, module, manager_list in (('Trays', trays, self.trays),
-                                                   ('Workers', workers, self.workers)):
-            # noinspection PyTypeChecker
-            item_configs: dict[str, ConfigDict] = kwargs.get(section_name, {})
-            for item_name, item_config in item_configs.items():
-                item_type = item_config.get('Type', None)
+    # noinspection PyMethodMayBeStatic
+    def get_log(self, subsystem: str) -> logging.Logger:
+        return logging.getLogger(f'arbies.{subsystem.lower()}')
+
+    def _create_item(self, section_name: str, item_name: str, item_config: ConfigDict) -> Tray | Worker:
+        from arbies import trays, workers
+
+        module = trays if section_name == 'Trays' else workers
+        item_type = item_config.get('Type', None)
 
-                if item_type is None:
-                    raise KeyError(f"{section_name}.{item_name} has no Type parameter")
+        if item_type is None:
+            raise KeyError(f"{section_name}.{item_name} has no Type parameter")
 
-                class_ = module.get(item_type)
+        class_ = self._plan.get_item_class(section_name, item_name, item_type) if self._plan is not None else None
+        if class_ is None:
+            class_ = module.get(item_type)
 
-                if class_ is None:
-                    raise KeyError(f"{section_name}.{item_name} has an unloadable Type parameter '{item_type}'")
+        if class_ is None:
+            raise KeyError(f"{section_name}.{item_name} has an unloadable Type parameter '{item_type}'")
 
-                instance = class_(self, **item_config)
-                manager_list.append(instance)
+        return class_(self, **item_config)
 
     @property
     def size(self) -> Vector2:
         return self._size
 
+    @property
+    def canvas_mode(self) -> str:
+        return self._canvas_mode
+
+    @property
+    def restored_frame(self) -> Image.Image | None:
+        return self._restored_frame
+
     @property
     def image(self) -> Image.Image:
         if self._image is None:
-            self._image = Image.new('RGBA', self._size, self._background_fill)
+            self._image = Image.new(self._canvas_mode, self._size, self._background_fill)
         return self._image
 
+    @property
+    def push_lead_time(self) -> float:
+        # How long before a frame is due it has to be pushed, going by the slowest tray's recent refreshes.
+        return max((tray.latency for tray in self.trays), default=0.0)
+
+    @property
+    def render_timeout(self) -> float:
+        return self._render_timeout
+
+    @property
+    def render_lead_time(self) -> float:
+        return self._render_ahead_time + self.push_lead_time
+
+    def new_image(self, size: Vector2, fill: ColorType | None = None) -> Image.Image:
+        # Canvas modes without alpha can't hold a transparent layer, so worker images start from the background.
+        if fill is None:
+            fill = 0 if 'A' in self._canvas_mode else self._background_fill
+        return Image.new(self._canvas_mode, size, fill)
+
     async def render_once(self):
         if self._render_task is not None:
             raise Exception('Manager is already rendering.')
 
         async def _inner():
             await self._startup()
-            await asyncio.gather(*(worker.render_once() for worker in self.workers))
 
-            for worker in self.workers:
-                worker_image: Image.Image | None = self._worker_images.get(worker, None)
-                if worker_image is not None:
-                    self._composite_image(worker_image, self.image, worker.box)
+            render_tasks: dict[asyncio.Task, Worker] = {asyncio.create_task(worker.render_once()): worker
+                                                        for worker in self.workers}
+            late_tasks: set[asyncio.Task] = set()
+            if len(render_tasks) > 0:
+                _, late_tasks = await asyncio.wait(render_tasks, timeout=self._once_deadline)
+
+            if len(late_tasks) > 0:
+                late_labels: str = ', '.join(render_tasks[task].label for task in late_tasks)
+
+                if self._late_push:
+                    self.log.warning('Pushing without %s, which will be pushed once finished', late_labels)
+                else:
+                    self.log.warning('Cancelling %s, which missed the deadline', late_labels)
+                    for task in late_tasks:
+                        task.cancel()
+                    await asyncio.gather(*late_tasks, return_exceptions=True)
+                    await asyncio.gather(*(render_tasks[task].render_fallback() for task in late_tasks))
+                    late_tasks = set()
+
+            async with self._worker_update_lock:
+                self._updated_workers.clear()
+                self._pending_boxes = []
+
+            self._composite_workers(self.image)
 
+            await self._discard_snapshot_frame()
             await asyncio.gather(*(tray.serve(self._image) for tray in self.trays))
+            self._on_served()
+
+            if len(late_tasks) > 0:
+                await asyncio.gather(*late_tasks, return_exceptions=True)
+                await self._render_workers()
+
             await self.shutdown()
 
         self._render_task = asyncio.create_task(_inner())
@@ -123,45 +286,27 @@ class Manager:
         if self._render_task is not None:
             raise Exception('Manager is already rendering.')
 
-        async def _render_workers():
-            await self._worker_update_lock.acquire()
-
-            try:
-                updated_workers: list[Worker] = list(self._updated_workers)
-                updated_boxes: list[Box] = [worker.box for worker in self._updated_workers]
-
-                if len(updated_workers) == 0:
-                    return
-
-                self._updated_workers.clear()
-            finally:
-                self._worker_update_lock.release()
-
-            self._clear(self.image)
-            for worker in self.workers:
-                worker_image: Image.Image | None = self._worker_images.get(worker, None)
-                if worker_image is not None:
-                    self._composite_image(worker_image, self.image, worker.box)
-
-            await asyncio.gather(*(tray.serve(self.image, updated_boxes) for tray in self.trays))
-
         async def _inner():
             await self._startup()
-            worker_loops: tuple[asyncio.Task, ...] = tuple()
-
-
 
             try:
-                worker_loops = tuple(asyncio.create_task(worker.render_loop()) for worker in self.workers)
+                for worker in self.workers:
+                    self._worker_loops[worker] = asyncio.create_task(worker.render_loop())
 
                 while True:
                     # Wait until every HH:MM:??, where ?? is the seconds cleanly divisible by _render_loop_interval.
                     await asyncio.sleep(self._render_loop_interval -
                                         (datetime.now().second % self._render_loop_interval))
-                    await _render_workers()
+                    await self._render_workers()
+
+                    if self._snapshot_store is not None and \
+                            time.monotonic() - self._snapshot_time >= self._snapshot_interval:
+                        await self.save_snapshot()
             except asyncio.CancelledError:
                 pass
             finally:
+                worker_loops = list(self._worker_loops.values())
+                self._worker_loops.clear()
                 for worker_loop in worker_loops:
                     worker_loop.cancel()
                 await asyncio.gather(*worker_loops)
@@ -170,12 +315,250 @@ class Manager:
         self._render_task = asyncio.create_task(_inner())
         return self._render_task
 
+    async def _render_workers(self):
+        async with self._push_lock:
+            await self._worker_update_lock.acquire()
+
+            try:
+                updated_workers: list[Worker] = list(self._updated_workers)
+                updated_boxes: list[Box] = [worker.box for worker in updated_workers] + self._pending_boxes
+
+                if len(updated_boxes) == 0:
+                    return
+
+                self._updated_workers.clear()
+                self._pending_boxes = []
+            finally:
+                self._worker_update_lock.release()
+
+            if self._damage_tile_size <= 0:
+                self._composite_workers(self.image)
+            else:
+                updated_boxes = self._composite_changes(updated_boxes)
+                # The first frame goes out regardless, as trays have nothing to show until then.
+                if len(updated_boxes) == 0 and self._first_pixel_time is not None:
+                    self.log.debug('Skipped pushing, no pixels changed')
+                    return
+
+            await self._discard_snapshot_frame()
+            await asyncio.gather(*(tray.serve(self.image, updated_boxes) for tray in self.trays))
+            self._on_served()
+
+    def _composite_changes(self, updated_boxes: list[Box]) -> list[Box]:
+        from arbies.drawing.geometry import Box, intersect_all, merge_overlapping
+        from arbies.drawing.tiles import changed_tiles
+
+        # The canvas still holds the previous frame, so only the areas about to be redrawn need keeping to compare.
+        areas: list[Box] = merge_overlapping(intersect_all(updated_boxes, Box(0, 0, *self.image.size)))
+        previous: list[Image.Image] = [self.image.crop(area) for area in areas]
+
+        self._composite_workers(self.image)
+
+        return [box for area, before in zip(areas, previous)
+                for box in changed_tiles(before, self.image.crop(area), area, self._damage_tile_size)]
+
+    async def schedule_worker_image(self, worker: Worker, image: Image.Image, due: datetime):
+        delay: float = (due - datetime.now()).total_seconds() - self.push_lead_time
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        await self.update_worker_image(worker, image)
+        # Push straight away rather than waiting for the next render loop interval.
+        await self._render_workers()
+
+    def watch_config(self, path: str):
+        from arbies.suppliers.filesystem import add_on_changed
+
+        path = os.path.abspath(path)
+        loop = asyncio.get_running_loop()
+
+        def _on_changed(_: str):
+            # Called from the watcher's thread.
+            loop.call_soon_threadsafe(self._schedule_reload, path)
+
+        add_on_changed(path, _on_changed)
+
+    def _schedule_reload(self, path: str):
+        task = asyncio.create_task(self.reload_config(path))
+        self._reload_tasks.add(task)
+        task.add_done_callback(self._reload_tasks.discard)
+
+    async def reload_config(self, path: str):
+        import toml
+        from arbies.plan import PlanError, load_plan
+
+        plan: Plan | None = None
+        try:
+            if self._plan is not None:
+                # Started from a plan, so the reloaded config is compiled, and checked, the same way.
+                plan = await asyncio.to_thread(load_plan, path)
+                config: ConfigDict = plan.config
+            else:
+                with open(path, 'r') as config_file:
+                    config = toml.load(config_file)
+        except (OSError, toml.TomlDecodeError, PlanError) as e:
+            self.log.error('Could not reload %s: %s', path, e)
+            return
+
+        try:
+            await self.apply_config(config, plan)
+        except (KeyError, ValueError) as e:
+            self.log.error('Could not apply %s: %s', path, e)
+        except Exception:
+            # Anything else, like a font that can't be opened or a tray that fails to start, is as likely from a bad
+            # config, and shouldn't go unnoticed in a task nothing awaits.
+            self.log.exception('Could not apply %s', path)
+
+    async def apply_config(self, config: ConfigDict, plan: Plan | None = None):
+        from arbies.drawing.font import Font
+
+        async with self._reload_lock:
+            for section_name in config.keys() | self.config.keys():
+                if section_name not in ('Trays', 'Workers', 'Fonts') and \
+                        config.get(section_name) != self.config.get(section_name):
+                    self.log.warning('Changes to %s will not take effect until restarted', section_name)
+
+            # Workers hold on to their fonts, so a font change rebuilds every worker.
+            fonts_changed: bool = config.get('Fonts', {}) != self.config.get('Fonts', {})
+            previous_fonts: dict[str, Font] = Font.get_registered()
+            fonts: dict[str, Font] = previous_fonts
+            if fonts_changed:
+                if plan is not None:
+                    fonts = {name: Font.get(spec.path, size=spec.size, line_height=spec.line_height)
+                             for name, spec in plan.fonts.items()}
+                else:
+                    fonts = {name: Font.from_config(name, item_config)
+                             for name, item_config in config.get('Fonts', {}).items()}
+
+            # The new fonts and plan are only swapped in for good once everything builds.
+            previous_plan: Plan | None = self._plan
+            Font.set_registered(fonts)
+            if plan is not None:
+                self._plan = plan
+                plan.install_text()
+
+            try:
+                new_trays, moved_workers, new_workers = self._create_changed_items(config, fonts_changed)
+            except BaseException:
+                Font.set_registered(previous_fonts)
+                self._plan = previous_plan
+                raise
+
+            tray_configs: dict[str, ConfigDict] = config.get('Trays', {})
+            worker_configs: dict[str, ConfigDict] = config.get('Workers', {})
+
+            for name in [name for name in self._named_trays if name in new_trays or name not in tray_configs]:
+                self.log.info('Removing tray %s', name)
+                await self._named_trays.pop(name).shutdown()
+
+            for name in [name for name in self._named_workers if name in new_workers or name not in worker_configs]:
+                self.log.info('Removing worker %s', name)
+                await self._remove_worker(self._named_workers.pop(name))
+
+            for name, item_config in moved_workers.items():
+                self.log.info('Moving worker %s', name)
+                await self._move_worker(self._named_workers[name], item_config.get('Position', (0, 0)))
+
+            self._named_trays.update(new_trays)
+            self._named_workers.update(new_workers)
+            self.trays = [self._named_trays[name] for name in tray_configs]
+            self.workers = [self._named_workers[name] for name in worker_configs]
+            self.config = config
+
+            for name, tray in new_trays.items():
+                self.log.info('Adding tray %s', name)
+                await tray.startup()
+                if self._image is not None:
+                    await tray.serve(self._image)
+
+            for name, worker in new_workers.items():
+                self.log.info('Adding worker %s', name)
+                await worker.startup()
+                if self._render_task is not None:
+                    self._worker_loops[worker] = asyncio.create_task(worker.render_loop())
+
+    def _create_changed_items(self, config: ConfigDict, fonts_changed: bool
+                              ) -> tuple[dict[str, Tray], dict[str, ConfigDict], dict[str, Worker]]:
+        # Builds everything first, so a bad config leaves the running one untouched.
+        tray_configs: dict[str, ConfigDict] = config.get('Trays', {})
+        worker_configs: dict[str, ConfigDict] = config.get('Workers', {})
+        old_tray_configs: dict[str, ConfigDict] = self.config.get('Trays', {})
+        old_worker_configs: dict[str, ConfigDict] = self.config.get('Workers', {})
+
+        new_trays: dict[str, Tray] = {
+            name: self._create_item('Trays', name, item_config)
+            for name, item_config in tray_configs.items()
+            if old_tray_configs.get(name) != item_config
+        }
+        moved_workers: dict[str, ConfigDict] = {
+            name: item_config
+            for name, item_config in worker_configs.items()
+            if not fonts_changed and name in old_worker_configs and old_worker_configs[name] != item_config and
+            {**old_worker_configs[name], 'Position': None} == {**item_config, 'Position': None}
+        }
+        new_workers: dict[str, Worker] = {
+            name: self._create_item('Workers', name, item_config)
+            for name, item_config in worker_configs.items()
+            if name not in moved_workers and (fonts_changed or old_worker_configs.get(name) != item_config)
+        }
+
+        return new_trays, moved_workers, new_workers
+
+    async def _remove_worker(self, worker: Worker):
+        worker_loop: asyncio.Task | None = self._worker_loops.pop(worker, None)
+        if worker_loop is not None:
+            worker_loop.cancel()
+            await asyncio.gather(worker_loop, return_exceptions=True)
+
+        await worker.shutdown()
+
+        async with self._worker_update_lock:
+            if self._worker_images.pop(worker, None) is not None:
+                self._pending_boxes.append(worker.box)
+            self._worker_opaque.pop(worker, None)
+            self._updated_workers.discard(worker)
+
+    async def _move_worker(self, worker: Worker, position: Vector2):
+        async with self._worker_update_lock:
+            self._pending_boxes.append(worker.box)
+            worker.move_to(position)
+            if worker in self._worker_images:
+                self._updated_workers.add(worker)
+
     async def _startup(self):
-        await asyncio.gather(*(tray.startup() for tray in self.trays))
+        self._start_time = time.monotonic()
+        self._first_pixel_time = None
+
+        # Suppliers the workers are known to need start alongside the trays, rather than on the first frame.
+        supplier_types: set[Type] = {type_ for worker in self.workers for type_ in worker.required_suppliers()}
+
+        async def _start_trays():
+            # Trays may pick up the restored frame as they start.
+            if self._snapshot_store is not None:
+                await self._restore_snapshot()
+            await asyncio.gather(*(tray.startup() for tray in self.trays))
+
+        await asyncio.gather(_start_trays(), *(self.get_supplier(type_) for type_ in supplier_types))
         await asyncio.gather(*(worker.startup() for worker in self.workers))
 
+        self.log.info('Started %d trays, %d suppliers and %d workers in %.3f seconds',
+                      len(self.trays), len(supplier_types), len(self.workers), time.monotonic() - self._start_time)
+
+    def _on_served(self):
+        if self._first_pixel_time is not None or self._start_time is None:
+            return
+
+        self._first_pixel_time = time.monotonic()
+        self.log.info('First frame pushed %.3f seconds after starting', self._first_pixel_time - self._start_time)
+
     async def shutdown(self):
+        for task in list(self._reload_tasks):
+            task.cancel()
+
         try:
+            if self._snapshot_store is not None and len(self._worker_images) > 0:
+                await self.save_snapshot()
+
             await asyncio.gather(*(worker.shutdown() for worker in self.workers))
             await asyncio.gather(*(tray.shutdown() for tray in self.trays))
             await asyncio.gather(*(supplier.shutdown() for supplier in self.suppliers))
@@ -185,48 +568,171 @@ class Manager:
             self._render_task = None
         except CancelledError:
             pass
+        finally:
+            # Detached, so a later Manager in the same process doesn't also log to this one's files.
+            self._remove_log_handlers()
+
+    def _get_worker_hash(self, name: str, worker: Worker) -> str:
+        # Anything that would change how a worker renders makes its snapshot stale.
+        key = json.dumps({'config': self.config.get('Workers', {}).get(name),
+                          'fonts': self.config.get('Fonts', {}),
+                          'box': worker.box,
+                          'mode': self._canvas_mode}, sort_keys=True, default=str)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    async def save_snapshot(self):
+        self._snapshot_time = time.monotonic()
+
+        # Held so no push lands between copying the frame and marking it saved.
+        async with self._push_lock:
+            async with self._worker_update_lock:
+                worker_images: dict[str, tuple[str, Image.Image]] = {
+                    name: (self._get_worker_hash(name, worker), self._worker_images[worker])
+                    for name, worker in self._named_workers.items()
+                    if self._worker_images.get(worker, None) is not None
+                }
+
+            # Only a frame the trays were actually served is worth restoring.
+            frame: Image.Image | None = self._image.copy() \
+                if self._image is not None and self._first_pixel_time is not None else None
+
+            try:
+                await asyncio.to_thread(self._snapshot_store.save, frame, worker_images)
+            except OSError as e:
+                self.log.error('Could not save snapshot to %s: %s', self._snapshot_store.path, e)
+                return
+
+            self._snapshot_frame_saved = frame is not None
+
+    async def _discard_snapshot_frame(self):
+        if not self._snapshot_frame_saved:
+            return
+
+        self._snapshot_frame_saved = False
+        try:
+            await asyncio.to_thread(self._snapshot_store.discard_frame)
+        except (OSError, ValueError) as e:
+            self.log.error('Could not discard snapshot frame in %s: %s', self._snapshot_store.path, e)
+
+    async def _restore_snapshot(self):
+        try:
+            frame, worker_images = await asyncio.to_thread(self._snapshot_store.load)
+        except (OSError, ValueError) as e:
+            self.log.error('Could not load snapshot from %s: %s', self._snapshot_store.path, e)
+            return
+
+        if frame is not None and frame.size == self._size and frame.mode == self._canvas_mode:
+            self._restored_frame = frame
+
+        async with self._worker_update_lock:
+            for name, worker in self._named_workers.items():
+                if name not in worker_images:
+                    continue
+
+                hash_, image = worker_images[name]
+                if hash_ != self._get_worker_hash(name, worker):
+                    continue
+
+                self._worker_images[worker] = image
+                # The snapshot may hold a fallback image, which needn't be as opaque as the worker declares.
+                self._worker_opaque[worker] = self._is_opaque(image)
+                self._restored_images[worker] = image
+                # Drawn into the first frame even when the worker's first render matches, so every tray gets one.
+                self._pending_boxes.append(worker.box)
+
+        self.log.info('Restored %d worker images from snapshot', len(self._restored_images))
+
+    def _composite_workers(self, target: Image.Image):
+        from arbies.drawing.geometry import Box
+
+        # Walk down from the top of the z-order, dropping any worker entirely hidden behind an opaque one above it.
+        visible: list[tuple[Worker, Image.Image, bool]] = []
+        covers: list[Box] = []
+
+        for worker in reversed(self.workers):
+            worker_image: Image.Image | None = self._worker_images.get(worker, None)
+            if worker_image is None or any(cover.contains(worker.box) for cover in covers):
+                continue
+
+            opaque: bool = self._worker_opaque.get(worker, False)
+            visible.append((worker, worker_image, opaque))
+            if opaque:
+                covers.append(worker.box)
+
+        canvas_box = Box(0, 0, target.width, target.height)
+        if not any(cover.contains(canvas_box) for cover in covers):
+            self._clear(target)
+
+        for worker, worker_image, opaque in reversed(visible):
+            if opaque:
+                self._paste_image(worker_image, target, worker.box)
+            else:
+                self._composite_image(worker_image, target, worker.box)
 
     def _clear(self, target: Image.Image):
         draw = ImageDraw.Draw(target)
         draw.rectangle((0, 0, target.width, target.height), fill=self._background_fill)
 
+    @staticmethod
+    def _is_opaque(image: Image.Image) -> bool:
+        if 'A' not in image.getbands():
+            return True
+        return image.getchannel('A').getextrema()[0] == 255
+
     @staticmethod
     def _paste_image(source: Image.Image, target: Image.Image, target_box: Box):
         target.paste(source, target_box)
 
     @staticmethod
     def _composite_image(source: Image.Image, target: Image.Image, target_box: Box):
+        if source.mode != 'RGBA':
+            target.paste(source, target_box, source.getchannel('A') if 'A' in source.getbands() else None)
+            return
+
         # Note: Image.Image.alpha_composite *would* be what we want here, but it is broken, as it attempts to
         # concatenate tuples.
         cropped = target.crop(target_box)
         composite = Image.alpha_composite(cropped, source)
         target.paste(composite, target_box)
 
+    def get_restored_image(self, worker: Worker) -> Image.Image | None:
+        return self._restored_images.get(worker, None)
+
     async def update_worker_image(self, worker: Worker, image: Image.Image):
-        self.log.debug(f'Updating {worker.label}')
+        self.log.debug('Updating %s', worker.label)
 
         await self._worker_update_lock.acquire()
 
         try:
+            # A first render matching what was restored from the snapshot is already on the panel.
+            restored: Image.Image | None = self._restored_images.pop(worker, None)
+            if restored is not None and restored.mode == image.mode and restored.size == image.size and \
+                    restored.tobytes() == image.tobytes():
+                return
+
             self._worker_images[worker] = image
+            opaque: bool | None = worker.get_image_opaque(image)
+            self._worker_opaque[worker] = opaque if opaque is not None else self._is_opaque(image)
             self._updated_workers.add(worker)
         finally:
             self._worker_update_lock.release()
 
     async def get_supplier(self, type_: Type) -> Supplier:
-        await self._supplier_lock.acquire()
+        supplier: Supplier | None = self._suppliers_by_type.get(type_, None)
+        if supplier is not None:
+            return supplier
 
-        try:
-            for supplier in self.suppliers:
-                if type(supplier) == type_:
-                    return supplier
+        async with self._supplier_locks.acquire(type_):
+            # Another caller may have started it while this one waited on the lock.
+            supplier = self._suppliers_by_type.get(type_, None)
+            if supplier is not None:
+                return supplier
 
-            supplier: Supplier = type_(self)
-            self.suppliers.add(supplier)
+            supplier = type_(self)
             await supplier.startup()
+            self.suppliers.add(supplier)
+            self._suppliers_by_type[type_] = supplier
             return supplier
-        finally:
-            self._supplier_lock.release()
 
     # noinspection PyMethodMayBeStatic
     def resolve_path(self, path: str) -> str:
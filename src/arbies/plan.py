@@ -0,0 +1,192 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import hashlib
+import os
+import pickle
+import tempfile
+import toml
+from typing import TYPE_CHECKING, Type
+
+if TYPE_CHECKING:
+    from arbies.manager import ConfigDict
+    from arbies.workers.text.runs import Run
+
+# Bumped whenever Plan changes shape, so stale caches are recompiled rather than misread.
+_plan_version: int = 1
+
+
+@dataclass(frozen=True)
+class FontSpec:
+    path: str
+    size: int
+    line_height: float
+
+
+@dataclass
+class Plan:
+    config: ConfigDict
+    # Keyed by section, item name and Type, so a reload that changes an item's Type doesn't pick up the old class.
+    item_classes: dict[tuple[str, str, str], Type] = field(default_factory=dict)
+    fonts: dict[str, FontSpec] = field(default_factory=dict)
+    text_runs: dict[str, list[Run]] = field(default_factory=dict)
+
+    def install(self):
+        from arbies.drawing.font import Font
+
+        for name, spec in self.fonts.items():
+            Font.register(name, Font.get(spec.path, size=spec.size, line_height=spec.line_height))
+
+        self.install_text()
+
+    def install_text(self):
+        from arbies.workers.text import TextWorker
+
+        TextWorker.add_parsed(self.text_runs)
+
+    def get_item_class(self, section_name: str, item_name: str, item_type: str) -> Type | None:
+        return self.item_classes.get((section_name, item_name, item_type), None)
+
+
+class PlanError(ValueError):
+    def __init__(self, path: str, problems: list[str]):
+        super().__init__(f'{path} has {len(problems)} problems:\n' + '\n'.join(f'  {problem}' for problem in problems))
+        self.problems: list[str] = problems
+
+
+def compile_plan(path: str, config: ConfigDict | None = None) -> Plan:
+    # Resolves and checks everything in the config that can be without starting it, reporting every problem at once.
+    import pytz
+    from arbies import trays, workers
+    from arbies.drawing.font import Font
+    from arbies.workers.text import TextWorker
+
+    if config is None:
+        with open(path, 'r') as config_file:
+            config = toml.load(config_file)
+
+    plan = Plan(config)
+    problems: list[str] = []
+
+    for section_name, module in (('Trays', trays), ('Workers', workers)):
+        for item_name, item_config in config.get(section_name, {}).items():
+            item_type: str | None = item_config.get('Type', None)
+            if item_type is None:
+                problems.append(f'{section_name}.{item_name} has no Type parameter')
+                continue
+
+            try:
+                class_ = module.get(item_type)
+            except ImportError as e:
+                problems.append(f'{section_name}.{item_name} Type "{item_type}" could not be imported: {e}')
+                continue
+
+            if class_ is None:
+                problems.append(f"{section_name}.{item_name} has an unloadable Type parameter '{item_type}'")
+                continue
+
+            plan.item_classes[(section_name, item_name, item_type)] = class_
+
+            if issubclass(class_, TextWorker) and 'Text' in item_config:
+                text: str = item_config['Text']
+                # noinspection PyProtectedMember
+                plan.text_runs[text] = TextWorker._parse(text)
+                for run_name in TextWorker.get_unknown_run_names(text):
+                    problems.append(f'Workers.{item_name} has an unknown text run "{run_name}"')
+
+    for font_name, font_config in config.get('Fonts', {}).items():
+        # noinspection PyProtectedMember
+        font_path: str | None = font_config.get('Path', Font._default_path)
+        if font_path is not None:
+            # Resolved now, as the plan may be installed from a different working directory or environment.
+            font_path = Font.resolve_path(font_path)
+        if font_path is None or not os.path.isfile(font_path):
+            problems.append(f'Fonts.{font_name} path "{font_path}" can not be found')
+            continue
+
+        # noinspection PyProtectedMember
+        plan.fonts[font_name] = FontSpec(font_path,
+                                         int(font_config.get('Size', Font._default_size)),
+                                         float(font_config.get('LineHeight', Font._default_line_height)))
+
+    for location_name, location_config in config.get('Locations', {}).items():
+        if location_config.get('Timezone', None) not in pytz.all_timezones_set:
+            problems.append(f'Locations.{location_name} has an unknown Timezone "{location_config.get("Timezone")}"')
+        coords = location_config.get('Coords', None)
+        if not isinstance(coords, list) or len(coords) != 2 or \
+                not all(isinstance(value, (int, float)) for value in coords):
+            problems.append(f'Locations.{location_name} Coords must be [latitude, longitude]')
+
+    if len(problems) > 0:
+        raise PlanError(path, problems)
+
+    return plan
+
+
+def get_cache_dir() -> str:
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'arbies')
+
+
+def load_plan(path: str, cache_dir: str | None = None) -> Plan:
+    # Loads the plan cached for the config, compiling and caching it first if the config has changed since.
+    path = os.path.abspath(path)
+    cache_path: str = _get_cache_path(path, cache_dir)
+    stat = os.stat(path)
+
+    cached = _read_cache(cache_path)
+    # Unchanged size and mtime are trusted without reading the config at all.
+    if cached is not None and cached[1:3] == (stat.st_mtime_ns, stat.st_size):
+        return cached[4]
+
+    with open(path, 'rb') as config_file:
+        data: bytes = config_file.read()
+    digest: str = hashlib.sha1(data).hexdigest()
+
+    if cached is not None and cached[3] == digest:
+        plan: Plan = cached[4]
+    else:
+        plan = compile_plan(path, toml.loads(data.decode('utf-8')))
+
+    _write_cache(cache_path, (_plan_version, stat.st_mtime_ns, stat.st_size, digest, plan))
+    return plan
+
+
+def save_plan(path: str, plan: Plan, cache_dir: str | None = None):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+
+    with open(path, 'rb') as config_file:
+        digest: str = hashlib.sha1(config_file.read()).hexdigest()
+
+    _write_cache(_get_cache_path(path, cache_dir), (_plan_version, stat.st_mtime_ns, stat.st_size, digest, plan))
+
+
+def _get_cache_path(path: str, cache_dir: str | None) -> str:
+    return os.path.join(cache_dir or get_cache_dir(), f'{hashlib.sha1(path.encode("utf-8")).hexdigest()}.plan')
+
+
+def _read_cache(cache_path: str) -> tuple | None:
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cached = pickle.load(cache_file)
+    except Exception:
+        # Anything unreadable, including plans pickled by a different version of the code, is just recompiled.
+        return None
+
+    if not isinstance(cached, tuple) or len(cached) != 5 or cached[0] != _plan_version:
+        return None
+
+    return cached
+
+
+def _write_cache(cache_path: str, cached: tuple):
+    directory: str = os.path.dirname(cache_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.arbies-', dir=directory)
+
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            pickle.dump(cached, temp_file)
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
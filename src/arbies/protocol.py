@@ -0,0 +1,71 @@
+from __future__ import annotations
+import asyncio
+from enum import IntEnum
+import struct
+import zlib
+
+# The wire format between NetworkTray and its receivers. Kept to the standard library, so receivers don't need the
+# render stack.
+
+# Every message is a header followed by a payload of the given length.
+#   magic, version, message type, codec, sequence number, payload length
+HEADER = struct.Struct('!4sBBBII')
+MAGIC: bytes = b'ARBS'
+VERSION: int = 1
+
+# KEYFRAME payloads are the frame's width, height and the length of its mode's name, then the name, followed by the
+# frame's compressed data.
+KEYFRAME = struct.Struct('!HHB')
+# DELTA payloads are a tile count, then each tile's box and compressed length, followed by its data.
+TILE_COUNT = struct.Struct('!H')
+TILE = struct.Struct('!HHHHI')
+# RESYNC payloads are the last sequence number the receiver applied.
+RESYNC = struct.Struct('!I')
+
+# Past this, a payload is taken for a corrupt or hostile header rather than read into memory. Enough for a keyframe
+# of an uncompressed 4096x4096 RGBA frame.
+MAX_PAYLOAD_LENGTH: int = 64 * 1024 * 1024
+
+
+class MessageType(IntEnum):
+    KEYFRAME = 1
+    DELTA = 2
+    RESYNC = 3
+
+
+class Codec(IntEnum):
+    NONE = 0
+    ZLIB = 1
+    LZ4 = 2
+
+
+def compress(codec: Codec, data: bytes) -> bytes:
+    if codec == Codec.ZLIB:
+        return zlib.compress(data, 1)
+    elif codec == Codec.LZ4:
+        import lz4.frame
+        return lz4.frame.compress(data)
+    return data
+
+
+def decompress(codec: Codec, data: bytes) -> bytes:
+    if codec == Codec.ZLIB:
+        return zlib.decompress(data)
+    elif codec == Codec.LZ4:
+        import lz4.frame
+        return lz4.frame.decompress(data)
+    return data
+
+
+def pack_message(type_: MessageType, codec: Codec, sequence: int, payload: bytes) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, type_, codec, sequence, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader, max_length: int = MAX_PAYLOAD_LENGTH
+                       ) -> tuple[MessageType, Codec, int, bytes]:
+    magic, version, type_, codec, sequence, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'Unexpected message header {magic!r} version {version}')
+    if length > max_length:
+        raise ValueError(f'Message payload of {length} bytes is over the limit of {max_length}')
+    return MessageType(type_), Codec(codec), sequence, await reader.readexactly(length)
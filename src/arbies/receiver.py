@@ -0,0 +1,121 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from PIL import Image
+from arbies.protocol import Codec, MessageType, KEYFRAME, RESYNC, TILE, TILE_COUNT, decompress, pack_message, \
+    read_message
+
+
+# Applies the frames a NetworkTray sends to a local image, writing it out after each update.
+class Receiver:
+    def __init__(self, output: str, framebuffer_mode: str | None = None):
+        self.image: Image.Image | None = None
+        self.sequence: int | None = None
+
+        self._output: str = output
+        # Set to write raw pixels packed in this mode, as to a framebuffer device, rather than an image file.
+        self._framebuffer_mode: str | None = framebuffer_mode
+
+    async def run(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                type_, codec, sequence, payload = await read_message(reader)
+
+                if type_ == MessageType.KEYFRAME:
+                    self._apply_keyframe(codec, payload)
+                elif type_ == MessageType.DELTA:
+                    # Deltas only apply on top of the one before, so after a gap nothing can be trusted until the next
+                    # keyframe.
+                    if self.sequence is None or sequence != self.sequence + 1:
+                        if self.sequence is not None:
+                            writer.write(pack_message(MessageType.RESYNC, Codec.NONE, 0, RESYNC.pack(self.sequence)))
+                            await writer.drain()
+                            self.sequence = None
+                        continue
+
+                    self._apply_delta(codec, payload)
+                else:
+                    continue
+
+                self.sequence = sequence
+                await asyncio.to_thread(self._write)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            # A message that can't be trusted, so the connection is started over rather than read on from it.
+            print(f'Dropped connection: {e}')
+        finally:
+            writer.close()
+
+    def _apply_keyframe(self, codec: Codec, payload: bytes):
+        width, height, mode_length = KEYFRAME.unpack_from(payload)
+        mode: str = payload[KEYFRAME.size:KEYFRAME.size + mode_length].decode('ascii')
+        data: bytes = decompress(codec, payload[KEYFRAME.size + mode_length:])
+        self.image = Image.frombytes(mode, (width, height), data)
+
+    def _apply_delta(self, codec: Codec, payload: bytes):
+        (count,) = TILE_COUNT.unpack_from(payload)
+        offset: int = TILE_COUNT.size
+
+        for _ in range(count):
+            x, y, width, height, length = TILE.unpack_from(payload, offset)
+            offset += TILE.size
+            tile = Image.frombytes(self.image.mode, (width, height), decompress(codec, payload[offset:offset + length]))
+            offset += length
+            self.image.paste(tile, (x, y))
+
+    def _write(self):
+        if self._framebuffer_mode is not None:
+            image = self.image if self.image.mode == 'RGBA' else self.image.convert('RGBA')
+            with open(self._output, 'wb') as framebuffer:
+                framebuffer.write(image.tobytes('raw', self._framebuffer_mode))
+            return
+
+        # Swapped in whole, so readers never see a partial frame.
+        directory: str = os.path.dirname(os.path.abspath(self._output))
+        fd, temp_path = tempfile.mkstemp(prefix='.arbies-', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                self.image.save(temp_file, 'PNG', compress_level=1)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self._output)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='Shows frames served by a Network tray.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7537)
+    parser.add_argument('--socket', default=None, help='Connect to a Unix socket instead')
+    parser.add_argument('-o', '--output', default='frame.png')
+    parser.add_argument('--framebuffer-mode', default=None, help='Write raw pixels in this mode, e.g. BGRA')
+    parser.add_argument('--reconnect', type=float, default=5.0, help='Seconds between reconnect attempts')
+
+    args = parser.parse_args()
+    receiver = Receiver(os.path.expanduser(args.output), args.framebuffer_mode)
+
+    while True:
+        try:
+            if args.socket is not None:
+                reader, writer = await asyncio.open_unix_connection(os.path.expanduser(args.socket))
+            else:
+                reader, writer = await asyncio.open_connection(args.host, args.port)
+        except OSError as e:
+            print(f'Could not connect: {e}')
+        else:
+            # Every connection starts over from a keyframe.
+            receiver.sequence = None
+            await receiver.run(reader, writer)
+
+        if args.reconnect <= 0:
+            return 0
+        await asyncio.sleep(args.reconnect)
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
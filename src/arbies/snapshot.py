@@ -0,0 +1,88 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from PIL import Image
+
+
+class SnapshotStore:
+    _index_name: str = 'index.json'
+    _frame_name: str = 'frame.png'
+
+    def __init__(self, path: str):
+        self.path: str = path
+
+    def save(self, frame: Image.Image | None, worker_images: dict[str, tuple[str, Image.Image]]):
+        os.makedirs(self.path, exist_ok=True)
+
+        index: dict = {'frame': None, 'workers': {}}
+
+        if frame is not None:
+            self._save_image(frame, self._frame_name)
+            index['frame'] = self._frame_name
+
+        for name, (hash_, image) in worker_images.items():
+            filename = f'worker-{hashlib.sha1(name.encode("utf-8")).hexdigest()}.png'
+            self._save_image(image, filename)
+            index['workers'][name] = {'hash': hash_, 'file': filename}
+
+        # The index is written last and swapped in whole, so a crash mid-save leaves the previous snapshot usable.
+        index_path = os.path.join(self.path, self._index_name)
+        with open(index_path + '.tmp', 'w') as index_file:
+            json.dump(index, index_file)
+        os.replace(index_path + '.tmp', index_path)
+
+    def discard_frame(self):
+        # For once the panel has moved on from the saved frame, so a crash before the next save doesn't leave a stale
+        # frame to be trusted as what the panel shows. Worker images are kept, as they're checked by hash anyway.
+        index_path = os.path.join(self.path, self._index_name)
+
+        if not os.path.isfile(index_path):
+            return
+
+        with open(index_path, 'r') as index_file:
+            index: dict = json.load(index_file)
+
+        if index.get('frame') is None:
+            return
+
+        index['frame'] = None
+        with open(index_path + '.tmp', 'w') as index_file:
+            json.dump(index, index_file)
+        os.replace(index_path + '.tmp', index_path)
+
+    def load(self) -> tuple[Image.Image | None, dict[str, tuple[str, Image.Image]]]:
+        index_path = os.path.join(self.path, self._index_name)
+
+        if not os.path.isfile(index_path):
+            return None, {}
+
+        with open(index_path, 'r') as index_file:
+            index: dict = json.load(index_file)
+
+        frame: Image.Image | None = None
+        if index.get('frame') is not None:
+            frame = self._load_image(index['frame'])
+
+        worker_images: dict[str, tuple[str, Image.Image]] = {}
+        for name, entry in index.get('workers', {}).items():
+            image = self._load_image(entry['file'])
+            if image is not None:
+                worker_images[name] = (entry['hash'], image)
+
+        return frame, worker_images
+
+    def _save_image(self, image: Image.Image, filename: str):
+        path = os.path.join(self.path, filename)
+        image.save(path + '.tmp', 'PNG', compress_level=1)
+        os.replace(path + '.tmp', path)
+
+    def _load_image(self, filename: str) -> Image.Image | None:
+        path = os.path.join(self.path, filename)
+
+        if not os.path.isfile(path):
+            return None
+
+        image = Image.open(path)
+        image.load()
+        return image
@@ -1,11 +1,32 @@
 from __future__ import annotations
 from abc import ABC
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, ContextManager, Hashable, MutableMapping
 from arbies.manager import Manager
 
+# Set when several processes render at once, so what one supplier fetches is reused by the rest. Entries are
+# (time.time() when stored, value), and ('claim', key) entries mark a key one process is already fetching.
+_shared_cache: MutableMapping[Hashable, tuple[float, Any]] | None = None
+# Held, across processes, while a key is checked and claimed.
+_shared_lock: ContextManager | None = None
+# Seconds other processes wait on a claim before assuming its process is gone and fetching the key themselves.
+_claim_timeout: float = 60.0
+_claim_poll_interval: float = 0.1
+
+
+def set_shared_cache(cache: MutableMapping[Hashable, tuple[float, Any]] | None, lock: ContextManager | None = None):
+    global _shared_cache, _shared_lock
+    _shared_cache = cache
+    _shared_lock = lock
+
 
 class Supplier(ABC):
     def __init__(self, manager: Manager):
         self._manager: Manager = manager
+        self._log: logging.Logger = manager.get_log('Suppliers')
 
     @property
     def manager(self) -> Manager:
@@ -16,3 +37,44 @@ class Supplier(ABC):
 
     async def shutdown(self):
         pass
+
+    @staticmethod
+    async def _fetch_shared[T](key: Hashable, fetch: Callable[[], Awaitable[T]], max_age: float | None = None) -> T:
+        # Fetches only what no other process has, or is fetching, already. Those asking for a key another process is
+        # fetching wait for its result rather than fetching it too.
+        if _shared_cache is None:
+            return await fetch()
+
+        claim_key: tuple = ('claim', key)
+        while True:
+            value, claimed = Supplier._claim_shared(key, claim_key, max_age)
+            if value is not None:
+                return value
+            if claimed:
+                break
+            await asyncio.sleep(_claim_poll_interval)
+
+        try:
+            value = await fetch()
+            _shared_cache[key] = (time.time(), value)
+            return value
+        finally:
+            # Released even if the fetch failed, so the next process to ask tries for itself.
+            _shared_cache.pop(claim_key, None)
+
+    @staticmethod
+    def _claim_shared(key: Hashable, claim_key: Hashable, max_age: float | None) -> tuple[Any | None, bool]:
+        # Returns the key's value if it is current, otherwise whether this process now holds the claim on it.
+        with _shared_lock or contextlib.nullcontext():
+            now: float = time.time()
+
+            entry: tuple[float, Any] | None = _shared_cache.get(key, None)
+            if entry is not None and (max_age is None or now - entry[0] < max_age):
+                return entry[1], False
+
+            claim: tuple[float, Any] | None = _shared_cache.get(claim_key, None)
+            if claim is not None and now - claim[0] < _claim_timeout:
+                return None, False
+
+            _shared_cache[claim_key] = (now, None)
+            return None, True
@@ -1,8 +1,25 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone, tzinfo
 from arbies.suppliers import Supplier
 
+# Set while rendering ahead, so everything rendered in that context sees the time it will be displayed at.
+_now_override: ContextVar[datetime | None] = ContextVar('now_override', default=None)
+
 
 class DateTimeSupplier(Supplier):
     @staticmethod
     def now_tz(tz: tzinfo | None = None) -> datetime:
-        return datetime.now(timezone.utc).astimezone(tz=tz)
+        now: datetime | None = _now_override.get()
+        if now is None:
+            now = datetime.now(timezone.utc)
+        return now.astimezone(tz=tz)
+
+    @staticmethod
+    @contextmanager
+    def rendering_at(time: datetime):
+        token = _now_override.set(time)
+        try:
+            yield
+        finally:
+            _now_override.reset(token)
@@ -70,6 +70,14 @@ class OnModifyObserver:
             if self.parent._filename is None or event.src_path == self.parent._filename:
                 self.parent._throttled_callback.trigger(event.src_path)
 
+        # Editors that save by writing a new file and renaming it over the old one never modify the watched file.
+        def on_created(self, event):
+            self.on_modified(event)
+
+        def on_moved(self, event):
+            if self.parent._filename is None or event.dest_path == self.parent._filename:
+                self.parent._throttled_callback.trigger(event.dest_path)
+
 
 class DirectoryIterationMethod(Enum):
     FileSystem = 0
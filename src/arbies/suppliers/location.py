@@ -35,6 +35,10 @@ class LocationSupplier(Supplier):
             if self._default_location is None:
                 self._default_location = location
 
+    @property
+    def locations(self) -> set[Location]:
+        return self._locations
+
     def get(self, name: str | None = None):
         if name is None:
             if self._default_location is not None:
@@ -0,0 +1,183 @@
+from __future__ import annotations
+import asyncio
+import errno
+from pathlib import Path
+import socket
+import struct
+from typing import Callable
+from arbies.manager import Manager
+from arbies.suppliers import Supplier
+
+InterfaceChangedCallback = Callable[[str, str], None]
+
+# rtnetlink, from linux/netlink.h, linux/rtnetlink.h and linux/if_link.h.
+_NETLINK_ROUTE: int = 0
+_RTMGRP_LINK: int = 1
+_RTM_NEWLINK: int = 16
+_RTM_DELLINK: int = 17
+_RTM_GETLINK: int = 18
+_NLM_F_REQUEST: int = 0x1
+_NLM_F_DUMP: int = 0x300
+_IFLA_IFNAME: int = 3
+_IFLA_OPERSTATE: int = 16
+
+#   length, type, flags, sequence number, port id
+_NLMSG_HEADER = struct.Struct('=IHHII')
+#   family, device type, index, flags, change mask
+_IFINFOMSG = struct.Struct('=BxHiII')
+#   length, type
+_RTATTR = struct.Struct('=HH')
+
+# Named as sysfs's operstate names them, indexed by IFLA_OPERSTATE.
+_operstates: tuple[str, ...] = ('unknown', 'notpresent', 'down', 'lowerlayerdown', 'testing', 'dormant', 'up')
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _parse_link_messages(data: bytes) -> list[tuple[str, str]]:
+    # Returns each link message's interface name and operstate. Removed interfaces are 'notpresent'.
+    links: list[tuple[str, str]] = []
+    offset: int = 0
+
+    while offset + _NLMSG_HEADER.size <= len(data):
+        length, type_, _, _, _ = _NLMSG_HEADER.unpack_from(data, offset)
+        if length < _NLMSG_HEADER.size:
+            break
+
+        if type_ in (_RTM_NEWLINK, _RTM_DELLINK):
+            name: str | None = None
+            state: str = 'unknown'
+
+            attribute_offset: int = offset + _NLMSG_HEADER.size + _IFINFOMSG.size
+            while attribute_offset + _RTATTR.size <= offset + length:
+                attribute_length, attribute_type = _RTATTR.unpack_from(data, attribute_offset)
+                if attribute_length < _RTATTR.size:
+                    break
+
+                value: bytes = data[attribute_offset + _RTATTR.size:attribute_offset + attribute_length]
+                if attribute_type == _IFLA_IFNAME:
+                    name = value.rstrip(b'\0').decode('utf-8', 'replace')
+                elif attribute_type == _IFLA_OPERSTATE and len(value) > 0 and value[0] < len(_operstates):
+                    state = _operstates[value[0]]
+
+                attribute_offset += _align(attribute_length)
+
+            if name is not None:
+                links.append((name, 'notpresent' if type_ == _RTM_DELLINK else state))
+
+        offset += _align(length)
+
+    return links
+
+
+class NetworkInterfaceSupplier(Supplier):
+    # Tracks interfaces' operstates, calling back only when one changes. Link changes are pushed by the kernel over
+    # rtnetlink, so nothing runs while nothing changes. Where rtnetlink isn't available, sysfs is polled instead.
+    def __init__(self, manager: Manager):
+        super().__init__(manager)
+
+        network_config = manager.config.get('NetworkInterfaces', {})
+        self._poll_interval: float = float(network_config.get('PollInterval', 5.0))
+
+        self._states: dict[str, str] = {}
+        self._callbacks: dict[str, set[InterfaceChangedCallback]] = {}
+        self._socket: socket.socket | None = None
+        self._poll_task: asyncio.Task | None = None
+
+    async def startup(self):
+        try:
+            self._socket = self._open_socket()
+        except (AttributeError, OSError) as e:
+            # AttributeError where the platform has no AF_NETLINK at all.
+            self._log.info('Could not subscribe to link changes, polling sysfs every %s seconds instead: %s',
+                           self._poll_interval, e)
+            self._poll_task = asyncio.create_task(self._poll_loop())
+            return
+
+        # The dump answering the request lands on the same socket as the changes, so is read the same way.
+        asyncio.get_running_loop().add_reader(self._socket.fileno(), self._on_readable)
+
+    async def shutdown(self):
+        if self._socket is not None:
+            asyncio.get_running_loop().remove_reader(self._socket.fileno())
+            self._socket.close()
+            self._socket = None
+
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def get_state(self, interface: str) -> str:
+        if interface not in self._states:
+            # Not yet heard of, as the dump is still arriving or the interface is only polled once watched.
+            self._states[interface] = self._read_sysfs_state(interface)
+        return self._states[interface]
+
+    def add_on_changed(self, interface: str, callback: InterfaceChangedCallback):
+        self._callbacks.setdefault(interface, set()).add(callback)
+        self.get_state(interface)
+
+    def remove_on_changed(self, interface: str, callback: InterfaceChangedCallback):
+        self._callbacks.get(interface, set()).discard(callback)
+
+    @staticmethod
+    def _open_socket() -> socket.socket:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE)
+        try:
+            sock.bind((0, _RTMGRP_LINK))
+            sock.setblocking(False)
+            request: bytes = _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+            sock.send(_NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(request), _RTM_GETLINK,
+                                         _NLM_F_REQUEST | _NLM_F_DUMP, 1, 0) + request)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _on_readable(self):
+        while self._socket is not None:
+            try:
+                data: bytes = self._socket.recv(65536)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    self._log.error('Could not read link changes: %s', e)
+                    return
+
+                # Fell behind a burst of changes, so whatever was missed is reread.
+                self._log.warning('Lost link changes, rereading interface states')
+                for interface in list(self._states):
+                    self._set_state(interface, self._read_sysfs_state(interface))
+                continue
+
+            if len(data) == 0:
+                return
+
+            for interface, state in _parse_link_messages(data):
+                self._set_state(interface, state)
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            for interface in list(self._callbacks):
+                self._set_state(interface, self._read_sysfs_state(interface))
+
+    def _set_state(self, interface: str, state: str):
+        previous: str | None = self._states.get(interface, None)
+        self._states[interface] = state
+        if previous is None or previous == state:
+            return
+
+        self._log.info('%s went from %s to %s', interface, previous, state)
+        for callback in list(self._callbacks.get(interface, ())):
+            callback(interface, state)
+
+    @staticmethod
+    def _read_sysfs_state(interface: str) -> str:
+        try:
+            return Path(f'/sys/class/net/{interface}/operstate').read_text().strip()
+        except OSError:
+            return 'notpresent'
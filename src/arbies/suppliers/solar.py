@@ -1,12 +1,15 @@
+from __future__ import annotations
 import aiohttp
+import asyncio
 from dataclasses import dataclass
-from datetime import datetime, timedelta, tzinfo
+from datetime import date, datetime, timedelta, timezone, tzinfo
 import json
+import math
 from string import Template
-from arbies.asyncutil import ContextLock
+from arbies.asyncutil import CircuitBreaker, ContextLock
 from arbies.manager import Manager
 from arbies.suppliers import Supplier
-from arbies.suppliers.location import Coords
+from arbies.suppliers.location import Coords, LocationSupplier
 
 
 @dataclass(frozen=True)
@@ -25,41 +28,173 @@ class SolarInfo:
 
 
 class SolarSupplier(Supplier):
+    _methods: tuple[str, ...] = ('local', 'remote')
     _cache_expire_time: int = 30 * 60
-    _sunrise_uri: Template = Template('https://api.sunrise-sunset.org/json?lat=$latitude&lng=$longitude&formatted=0')
+    # Local and remote times further apart than this are reported by the cross check.
+    _cross_check_tolerance: timedelta = timedelta(minutes=2)
+    _request_timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=30.0)
+    _sunrise_uri: Template = Template('https://api.sunrise-sunset.org/json?lat=$latitude&lng=$longitude&date=$date'
+                                      '&formatted=0')
 
     def __init__(self, manager: Manager):
         super().__init__(manager)
 
+        solar_config = manager.config.get('Solar', {})
+        self._method: str = str(solar_config.get('Method', 'Local')).lower()
+        if self._method not in self._methods:
+            raise ValueError(f'Unknown solar method "{self._method}", expected one of {self._methods}.')
+        self._cross_check: bool = bool(solar_config.get('CrossCheck', False))
+
         self._cache_locks = ContextLock()
+        self._breaker = CircuitBreaker('Solar service')
         self._solar_info_cache: dict[Coords, tuple[datetime, SolarInfo]] = {}
+        self._year_tables: dict[tuple[Coords, int], list[SolarInfo]] = {}
+        self._cross_checked: set[tuple[Coords, date]] = set()
+        self._cross_check_tasks: set[asyncio.Task] = set()
+
+    async def startup(self):
+        if self._method != 'local':
+            return
+
+        location_supplier: LocationSupplier = await self.manager.get_supplier(LocationSupplier)
+        year: int = datetime.now().year
+        for location in location_supplier.locations:
+            self._get_year_table(location.coords, year)
+
+    async def shutdown(self):
+        for task in self._cross_check_tasks:
+            task.cancel()
 
     async def get_solar_info(self, time: datetime, coords: Coords, tz: tzinfo | None = None) -> SolarInfo:
-        async with self._cache_locks.acquire(coords):
-            solar_info: SolarInfo
+        if self._method == 'local':
+            day: date = time.date()
+            solar_info: SolarInfo = self._get_year_table(coords, day.year)[day.timetuple().tm_yday - 1]
+
+            if self._cross_check and (coords, day) not in self._cross_checked:
+                self._cross_checked.add((coords, day))
+                task = asyncio.create_task(self._check_remote(coords, day, solar_info))
+                self._cross_check_tasks.add(task)
+                task.add_done_callback(self._cross_check_tasks.discard)
+
+            return solar_info.as_tz(tz)
 
+        async with self._cache_locks.acquire(coords):
             if coords not in self._solar_info_cache or time.date() != self._solar_info_cache[coords][0].date():
-                solar_info = await self._get_solar_info(coords)
+                solar_info = await self._fetch_shared(
+                    ('solar', coords, time.date()),
+                    lambda: self._breaker.call(self._get_remote_solar_info, coords, time.date()))
                 self._solar_info_cache[coords] = (time, solar_info)
             else:
                 solar_info = self._solar_info_cache[coords][1]
 
             return solar_info.as_tz(tz)
 
+    def _get_year_table(self, coords: Coords, year: int) -> list[SolarInfo]:
+        key = (coords, year)
+        if key not in self._year_tables:
+            first = date(year, 1, 1)
+            days: int = (date(year + 1, 1, 1) - first).days
+            self._year_tables[key] = [compute_solar_info(first + timedelta(days=i), coords) for i in range(days)]
+        return self._year_tables[key]
+
+    async def _check_remote(self, coords: Coords, day: date, local: SolarInfo):
+        try:
+            remote: SolarInfo = await self._breaker.call(self._get_remote_solar_info, coords, day)
+        except Exception as e:
+            self._log.warning('Could not cross check solar info for %s on %s: %s', coords, day, e)
+            return
+
+        for field in ('sunrise', 'sunset', 'solar_noon'):
+            difference: timedelta = abs(getattr(local, field) - getattr(remote, field))
+            if difference > self._cross_check_tolerance:
+                self._log.warning('Local %s for %s on %s is off from the solar service by %s',
+                                  field, coords, day, difference)
+
     @staticmethod
-    async def _get_solar_info(coords: Coords) -> SolarInfo:
-        uri = SolarSupplier._sunrise_uri.substitute(latitude=coords.latitude, longitude=coords.longitude)
-        async with aiohttp.ClientSession() as session, session.get(uri) as response:
+    async def _get_remote_solar_info(coords: Coords, day: date) -> SolarInfo:
+        uri = SolarSupplier._sunrise_uri.substitute(latitude=coords.latitude,
+                                                    longitude=coords.longitude,
+                                                    date=day.isoformat())
+        async with aiohttp.ClientSession(timeout=SolarSupplier._request_timeout) as session, \
+                session.get(uri) as response:
             if response.status != 200:
-                raise IOError(f'Weather service returned {response.status}: {response.content}')
+                raise IOError(f'Solar service returned {response.status}: {response.content}')
 
             try:
                 data = json.loads(await response.text())['results']
             except json.JSONDecodeError:
-                raise ValueError(f'DateTime service returned unparseable response: {response.content}')
+                raise ValueError(f'Solar service returned unparseable response: {response.content}')
 
             return SolarInfo(
                 day_length=timedelta(seconds=data['day_length']),
                 sunrise=datetime.fromisoformat(data['sunrise']),
                 sunset=datetime.fromisoformat(data['sunset']),
                 solar_noon=datetime.fromisoformat(data['solar_noon']))
+
+
+# Sun's altitude at rise and set, allowing for refraction and the size of its disc.
+_zenith_at_horizon: float = math.radians(90.833)
+
+
+# Computes the sun's times for a day with NOAA's solar calculator equations, good to about a minute.
+def compute_solar_info(day: date, coords: Coords) -> SolarInfo:
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    julian_day: float = day.toordinal() + 1721424.5
+    latitude: float = math.radians(coords.latitude)
+
+    # Each time is first estimated with the sun as of local noon, then refined with the sun as of that estimate.
+    noon: float = 720.0 - 4.0 * coords.longitude
+    for _ in range(2):
+        equation_of_time, _declination = _solar_position(julian_day + noon / 1440.0)
+        noon = 720.0 - 4.0 * coords.longitude - equation_of_time
+
+    def event_minutes(direction: float) -> float:
+        minutes: float = noon
+        for _ in range(2):
+            equation_of_time, declination = _solar_position(julian_day + minutes / 1440.0)
+            cos_hour_angle: float = (math.cos(_zenith_at_horizon) / (math.cos(latitude) * math.cos(declination)) -
+                                     math.tan(latitude) * math.tan(declination))
+            # Clamped for polar days and nights, where the sun never crosses the horizon.
+            hour_angle: float = math.degrees(math.acos(min(1.0, max(-1.0, cos_hour_angle))))
+            minutes = 720.0 - 4.0 * (coords.longitude + direction * hour_angle) - equation_of_time
+        return minutes
+
+    sunrise: float = event_minutes(1.0)
+    sunset: float = event_minutes(-1.0)
+
+    return SolarInfo(
+        day_length=timedelta(minutes=sunset - sunrise),
+        sunrise=midnight + timedelta(minutes=sunrise),
+        sunset=midnight + timedelta(minutes=sunset),
+        solar_noon=midnight + timedelta(minutes=noon))
+
+
+def _solar_position(julian_day: float) -> tuple[float, float]:
+    # Returns the equation of time in minutes, and the sun's declination in radians.
+    t: float = (julian_day - 2451545.0) / 36525.0
+
+    mean_longitude: float = math.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360.0)
+    mean_anomaly: float = math.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    eccentricity: float = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+
+    center: float = (math.sin(mean_anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t)) +
+                     math.sin(2.0 * mean_anomaly) * (0.019993 - 0.000101 * t) +
+                     math.sin(3.0 * mean_anomaly) * 0.000289)
+    omega: float = math.radians(125.04 - 1934.136 * t)
+    apparent_longitude: float = math.radians(math.degrees(mean_longitude) + center - 0.00569 -
+                                             0.00478 * math.sin(omega))
+
+    mean_obliquity: float = 23.0 + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0
+    obliquity: float = math.radians(mean_obliquity + 0.00256 * math.cos(omega))
+
+    declination: float = math.asin(math.sin(obliquity) * math.sin(apparent_longitude))
+
+    y: float = math.tan(obliquity / 2.0) ** 2
+    equation_of_time: float = 4.0 * math.degrees(
+        y * math.sin(2.0 * mean_longitude) -
+        2.0 * eccentricity * math.sin(mean_anomaly) +
+        4.0 * eccentricity * y * math.sin(mean_anomaly) * math.cos(2.0 * mean_longitude) -
+        0.5 * y * y * math.sin(4.0 * mean_longitude) -
+        1.25 * eccentricity * eccentricity * math.sin(2.0 * mean_anomaly))
+
+    return equation_of_time, declination
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import json
 from string import Template
-from arbies.asyncutil import ContextLock
+from arbies.asyncutil import CircuitBreaker, ContextLock
 from arbies.manager import Manager
 from arbies.suppliers import Supplier
 from arbies.suppliers.location import Coords
@@ -34,11 +34,13 @@ class WeatherSupplier(Supplier):
     _gps_grid_lookup_uri: Template = Template('https://api.weather.gov/points/$latitude,$longitude')
     _weather_weekly_uri: Template = Template('https://api.weather.gov/gridpoints/$office/$gridx,$gridy/forecast')
     _weather_hourly_uri: Template = Template('https://api.weather.gov/gridpoints/$office/$gridx,$gridy/forecast/hourly')
+    _request_timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=30.0)
 
     def __init__(self, manager: Manager):
         super().__init__(manager)
 
         self._cache_locks = ContextLock()
+        self._breaker = CircuitBreaker('Weather service')
         self._coords_grid_lookup: dict[Coords, GridCoords] = {}
         self._periods_cache: dict[GridCoords, tuple[datetime, WeatherPeriod]] = {}
 
@@ -47,40 +49,46 @@ class WeatherSupplier(Supplier):
 
         async with self._cache_locks.acquire(coords):
             if coords not in self._coords_grid_lookup:
-                self._coords_grid_lookup[coords] = await self._get_gps_grid(coords)
+                self._coords_grid_lookup[coords] = await self._fetch_shared(
+                    ('weather.grid', coords), lambda: self._breaker.call(self._get_gps_grid, coords))
             grid = self._coords_grid_lookup[coords]
             now = DateTimeSupplier.now_tz()
 
-            if coords in self._periods_cache and \
+            if grid in self._periods_cache and \
                     (now - self._periods_cache[grid][0]).total_seconds() < self._cache_expire_time:
                 return self._periods_cache[grid][1]
 
-            weekly_period_task = self._get_current_raw_period(self._weather_weekly_uri, grid)
-            hourly_period_task = self._get_current_raw_period(self._weather_hourly_uri, grid)
-
-            weekly_period: WeatherPeriod = await weekly_period_task
-            hourly_period: WeatherPeriod = await hourly_period_task
-
-            period: WeatherPeriod = WeatherPeriod(
-                name='Now',
-                start_time=hourly_period.start_time,
-                end_time=hourly_period.end_time,
-                is_daytime=hourly_period.is_daytime,
-                short_forecast=hourly_period.short_forecast,
-                long_forecast=weekly_period.long_forecast,
-                temperature=hourly_period.temperature,
-                wind_direction=hourly_period.wind_direction,
-                wind_speed=hourly_period.wind_speed
-            )
-
+            period: WeatherPeriod = await self._fetch_shared(('weather.period', grid),
+                                                             lambda: self._get_remote_period(grid),
+                                                             self._cache_expire_time)
             self._periods_cache[grid] = (now, period)
 
         return period
 
+    async def _get_remote_period(self, grid: GridCoords) -> WeatherPeriod:
+        weekly_period_task = self._breaker.call(self._get_current_raw_period, self._weather_weekly_uri, grid)
+        hourly_period_task = self._breaker.call(self._get_current_raw_period, self._weather_hourly_uri, grid)
+
+        weekly_period: WeatherPeriod = await weekly_period_task
+        hourly_period: WeatherPeriod = await hourly_period_task
+
+        return WeatherPeriod(
+            name='Now',
+            start_time=hourly_period.start_time,
+            end_time=hourly_period.end_time,
+            is_daytime=hourly_period.is_daytime,
+            short_forecast=hourly_period.short_forecast,
+            long_forecast=weekly_period.long_forecast,
+            temperature=hourly_period.temperature,
+            wind_direction=hourly_period.wind_direction,
+            wind_speed=hourly_period.wind_speed
+        )
+
     @staticmethod
     async def _get_gps_grid(coords: Coords) -> GridCoords:
         uri = WeatherSupplier._gps_grid_lookup_uri.substitute(latitude=coords.latitude, longitude=coords.longitude)
-        async with aiohttp.ClientSession() as session, session.get(uri) as response:
+        async with aiohttp.ClientSession(timeout=WeatherSupplier._request_timeout) as session, \
+                session.get(uri) as response:
             if response.status != 200:
                 raise IOError(f'Weather service returned {response.status}: {response.content}')
 
@@ -96,7 +104,8 @@ class WeatherSupplier(Supplier):
     @staticmethod
     async def _get_current_raw_period(uri_template: Template, grid: GridCoords) -> WeatherPeriod:
         uri = uri_template.substitute(office=grid.office, gridx=grid.x, gridy=grid.y)
-        async with aiohttp.ClientSession() as session, session.get(uri) as response:
+        async with aiohttp.ClientSession(timeout=WeatherSupplier._request_timeout) as session, \
+                session.get(uri) as response:
             content = await response.text()
             if response.status != 200:
                 raise IOError(f'Weather service returned {response.status}: {content}')
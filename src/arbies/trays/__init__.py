@@ -1,16 +1,22 @@
 from __future__ import annotations
 from abc import ABC
+import logging
+import time
 from _collections import defaultdict
 from PIL import Image
 from arbies import import_module_class_from_fullname
-from arbies.drawing.geometry import Vector2, Box
+from arbies.drawing.dithering import Quantizer
+from arbies.drawing.geometry import Vector2, Box, scale_all
 from arbies.manager import Manager
+from arbies.trays.damage import DamageConfig, coalesce
 from typing import Type
 
 
 _registered: dict[str, str] = {
     'file': 'arbies.trays.file.FileTray',
     'framebuffer': 'arbies.trays.framebuffer.FramebufferTray',
+    'network': 'arbies.trays.network.NetworkTray',
+    'stream': 'arbies.trays.stream.StreamTray',
     'tk': 'arbies.trays.tk.TkTray',
     'waveshareepd': 'arbies.trays.waveshareepd.WaveShareEPDTray',
     'waveshareit8951hat': 'arbies.trays.waveshareit8951hat.WaveShareIT8951HATTray',
@@ -28,6 +34,7 @@ def get(name: str) -> Type | None:
 
 class Tray(ABC):
     _instances: dict[str, list[Tray]] = defaultdict(list)
+    _default_damage_config: DamageConfig = DamageConfig()
 
     def __init__(self, manager: Manager, **kwargs):
         name = self.__class__.__name__
@@ -37,13 +44,43 @@ class Tray(ABC):
         Tray._instances[name].append(self)
 
         self._manager: Manager = manager
+        self._log: logging.Logger = manager.get_log('Trays')
         self._label: str = f'{name}[{len(Tray._instances[name]) - 1}]'
         self._size: Vector2 = Vector2(kwargs.get('Size', manager.size))
 
+        self._quantizer: Quantizer | None = None
+        if 'Dither' in kwargs or 'Levels' in kwargs:
+            levels: int | None = int(kwargs['Levels']) if 'Levels' in kwargs else None
+            self._quantizer = Quantizer(kwargs.get('Dither', None), levels)
+
+        alignment = kwargs.get('DamageAlignment', (self._default_damage_config.x_alignment,
+                                                   self._default_damage_config.y_alignment))
+        if isinstance(alignment, int):
+            alignment = (alignment, 1)
+        max_regions = kwargs.get('DamageMaxRegions', self._default_damage_config.max_regions)
+        self._damage_config: DamageConfig = DamageConfig(
+            x_alignment=int(alignment[0]),
+            y_alignment=int(alignment[1]),
+            update_overhead=int(kwargs.get('DamageOverhead', self._default_damage_config.update_overhead)),
+            max_regions=int(max_regions) if max_regions is not None else None)
+        self._damage: list[Box] | None = None
+        # Until a tray has been served a whole frame, partial updates would leave the rest of it blank. Trays that
+        # start out already showing the manager's restored frame can clear this.
+        self._needs_full_frame: bool = True
+        self._latency: float = 0.0
+
     @property
     def size(self) -> Vector2:
         return self._size
 
+    @property
+    def damage(self) -> list[Box] | None:
+        return self._damage
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
     async def startup(self):
         pass
 
@@ -51,14 +88,24 @@ class Tray(ABC):
         pass
 
     async def serve(self, image: Image.Image, updated_boxes: list[Box] | None = None):
+        if self._needs_full_frame:
+            updated_boxes = None
+            self._needs_full_frame = False
         if self._size != image.size:
             if updated_boxes is not None:
-                scale = (self._size[0] / image.size[0], self._size[1] / image.size[1])
-                updated_boxes = [Box(box.x * scale[0], box.y * scale[1],
-                                     box.w * scale[0], box.z * scale[1])
-                                 for box in updated_boxes]
+                updated_boxes = scale_all(updated_boxes, self._size[0] / image.size[0], self._size[1] / image.size[1])
             image = image.resize(self._size)
+        if self._quantizer is not None:
+            # Dithering can change pixels beyond the updated boxes, so they are coalesced after it.
+            image, updated_boxes = self._quantizer.apply(image, updated_boxes)
+        if updated_boxes is not None:
+            updated_boxes = coalesce(updated_boxes, Box(0, 0, *self._size), self._damage_config)
+        self._damage = updated_boxes
+        start: float = time.monotonic()
         await self._serve_internal(image, updated_boxes)
+        elapsed: float = time.monotonic() - start
+        # Smoothed, so one slow refresh doesn't throw off how early frames are pushed.
+        self._latency = elapsed if self._latency == 0.0 else self._latency * 0.75 + elapsed * 0.25
 
     async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
         raise NotImplemented
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable
+from arbies.drawing.geometry import Box, merge_overlapping
+
+
+@dataclass(frozen=True)
+class DamageConfig:
+    x_alignment: int = 1
+    y_alignment: int = 1
+    # The cost of pushing one more region, expressed in pixels. Two regions are merged whenever the pixels the merge
+    # adds are cheaper than the extra update.
+    update_overhead: int = 0
+    max_regions: int | None = None
+
+
+def align(box: Box, bounds: Box, config: DamageConfig) -> Box | None:
+    x_align, y_align = config.x_alignment, config.y_alignment
+    aligned = Box(int(box[0] // x_align * x_align),
+                  int(box[1] // y_align * y_align),
+                  int(-(-box[2] // x_align) * x_align),
+                  int(-(-box[3] // y_align) * y_align))
+    return bounds.intersection(aligned)
+
+
+def coalesce(boxes: Iterable[Box], bounds: Box, config: DamageConfig) -> list[Box]:
+    regions: list[Box] = merge_overlapping(box for box in (align(box, bounds, config) for box in boxes)
+                                           if box is not None)
+
+    while len(regions) > 1:
+        best: tuple[int, int, int, Box] | None = None
+
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                union = regions[i].union(regions[j])
+                cost = union.area - regions[i].area - regions[j].area
+                if best is None or cost < best[0]:
+                    best = (cost, i, j, union)
+
+        cost, i, j, union = best
+        if cost > config.update_overhead and (config.max_regions is None or len(regions) <= config.max_regions):
+            break
+
+        del regions[j], regions[i]
+        regions = merge_overlapping(regions + [union])
+
+    return regions
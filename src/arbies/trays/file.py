@@ -1,4 +1,9 @@
 from __future__ import annotations
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
 from PIL import Image
 from arbies.drawing.geometry import Box
 from arbies.manager import Manager
@@ -11,10 +16,53 @@ class FileTray(Tray):
 
         self._format: str = kwargs.get('Format', 'PNG')
         self._mode: str = kwargs.get('Mode', 'RGBA')
+        self._colors: int = int(kwargs.get('Colors', 256))
+        self._compress_level: int | None = int(kwargs['CompressLevel']) if 'CompressLevel' in kwargs else None
+        self._optimize: bool = bool(kwargs.get('Optimize', False))
         path: str = kwargs.get('Path', f'output.{self._format.lower()}')
         self._path: str = manager.resolve_path(path)
 
+        self._last_digest: bytes | None = None
+
     async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
-        target = image if image.mode == self._mode else image.copy().convert(self._mode)
-        target.save(self._path, self._format)
-        self._manager.log.info(f'Wrote {self._path} ({self._format}, {self._mode})')
+        data: bytes = await asyncio.to_thread(self._encode, image)
+        digest: bytes = hashlib.sha1(data).digest()
+
+        if digest == self._last_digest:
+            self._log.debug('Skipped writing %s, frame is unchanged', self._path)
+            return
+
+        await asyncio.to_thread(self._write, data)
+        self._last_digest = digest
+        self._log.info('Wrote %s (%s, %s)', self._path, self._format, self._mode)
+
+    def _encode(self, image: Image.Image) -> bytes:
+        if image.mode == self._mode:
+            target = image
+        elif self._mode == 'P':
+            target = image.convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE, colors=self._colors)
+        else:
+            target = image.convert(self._mode)
+
+        params: dict = {'optimize': self._optimize}
+        if self._compress_level is not None:
+            params['compress_level'] = self._compress_level
+
+        stream = io.BytesIO()
+        target.save(stream, self._format, **params)
+        return stream.getvalue()
+
+    def _write(self, data: bytes):
+        # Write to a temporary file alongside the target and swap it in, so readers never see a partial frame.
+        directory: str = os.path.dirname(os.path.abspath(self._path))
+        fd, temp_path = tempfile.mkstemp(prefix='.arbies-', dir=directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            # mkstemp creates owner-only files, which would lock out other readers of the output.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -14,7 +14,10 @@ class FramebufferTray(Tray):
         self._path: str = manager.resolve_path(path)
 
     async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
-        self._manager.log.info(f'Writing to {self._path} {self.size}')
+        self._log.info('Writing to %s %s', self._path, self.size)
+        # Mode is a raw packing of RGBA (e.g. BGRA), so other canvas modes are widened first.
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
         fb_data = image.tobytes('raw', self._mode)
         with open(self._path, 'wb') as fb:
             fb.write(fb_data)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import asyncio
+import struct
+from PIL import Image
+from arbies.drawing.geometry import Box
+from arbies.drawing.tiles import iter_tiles
+from arbies.manager import Manager
+from arbies.protocol import Codec, MessageType, KEYFRAME, RESYNC, TILE, TILE_COUNT, compress, pack_message, \
+    read_message
+from arbies.trays import Tray
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int):
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(queue_size)
+        # Set when the client can't be sent deltas, as it is missing one, until it is sent a keyframe.
+        self.needs_keyframe: bool = True
+
+
+class NetworkTray(Tray):
+    _codecs: dict[str, Codec] = {'none': Codec.NONE, 'zlib': Codec.ZLIB, 'lz4': Codec.LZ4}
+
+    def __init__(self, manager: Manager, **kwargs):
+        super().__init__(manager, **kwargs)
+
+        # Loopback only unless told otherwise, as frames may show anything a worker renders.
+        self._host: str = kwargs.get('Host', '127.0.0.1')
+        self._port: int = int(kwargs.get('Port', 7537))
+        socket_path: str | None = kwargs.get('SocketPath', None)
+        self._socket_path: str | None = manager.resolve_path(socket_path) if socket_path is not None else None
+        self._tile_size: int = int(kwargs.get('TileSize', 32))
+        # Messages queued for a client that isn't keeping up, beyond which it is dropped to a keyframe instead.
+        self._queue_size: int = int(kwargs.get('QueueSize', 8))
+
+        codec_name: str = str(kwargs.get('Compression', 'zlib')).lower()
+        if codec_name not in self._codecs:
+            raise ValueError(f'Unknown compression "{codec_name}", expected one of {tuple(self._codecs)}.')
+        self._codec: Codec = self._codecs[codec_name]
+
+        self._server: asyncio.Server | None = None
+        self._clients: set[_Client] = set()
+        self._image: Image.Image | None = None
+        self._sequence: int = 0
+
+    async def startup(self):
+        if self._codec == Codec.LZ4:
+            # Fail at startup rather than on the first frame.
+            import lz4.frame
+
+        if self._socket_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, self._socket_path)
+            self._log.info('%s serving frames on %s', self._label, self._socket_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+            self._log.info('%s serving frames on %s:%s', self._label, self._host, self._port)
+
+    async def shutdown(self):
+        if self._server is not None:
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
+        previous: Image.Image | None = self._image
+        self._image = image.copy()
+
+        if updated_boxes is not None and len(updated_boxes) == 0:
+            return
+
+        # Deltas only make sense against the frame receivers already hold.
+        if previous is None or previous.mode != image.mode or previous.size != image.size or updated_boxes is None:
+            self._sequence += 1
+            for client in self._clients:
+                client.needs_keyframe = True
+            await self._send_keyframes()
+            return
+
+        delta: bytes | None = await asyncio.to_thread(self._encode_delta, previous, self._image, updated_boxes)
+        if delta is None:
+            return
+
+        self._sequence += 1
+        message: bytes = pack_message(MessageType.DELTA, self._codec, self._sequence, delta)
+        for client in self._clients:
+            if client.needs_keyframe:
+                continue
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._log.warning('%s client fell behind, resyncing it with a keyframe', self._label)
+                client.needs_keyframe = True
+
+        await self._send_keyframes()
+
+    def _encode_delta(self, previous: Image.Image, image: Image.Image, updated_boxes: list[Box]) -> bytes | None:
+        tiles: list[bytes] = []
+
+        for tile in iter_tiles(Box(0, 0, *image.size), self._tile_size, updated_boxes):
+            data: bytes = image.crop(tile).tobytes()
+            if data == previous.crop(tile).tobytes():
+                continue
+
+            compressed: bytes = compress(self._codec, data)
+            tiles.append(TILE.pack(tile[0], tile[1], tile.width, tile.height, len(compressed)) + compressed)
+
+        if len(tiles) == 0:
+            return None
+
+        return TILE_COUNT.pack(len(tiles)) + b''.join(tiles)
+
+    async def _send_keyframes(self):
+        while self._image is not None and any(client.needs_keyframe for client in self._clients):
+            image: Image.Image = self._image
+            sequence: int = self._sequence
+            keyframe: bytes = await asyncio.to_thread(self._encode_keyframe, image)
+            if sequence != self._sequence:
+                # A newer frame was served while this one was compressed, so the keyframe must be of that instead.
+                continue
+
+            message: bytes = pack_message(MessageType.KEYFRAME, self._codec, sequence, keyframe)
+            for client in [client for client in self._clients if client.needs_keyframe]:
+                # Anything still queued is superseded by the keyframe.
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+                client.queue.put_nowait(message)
+                client.needs_keyframe = False
+
+    def _encode_keyframe(self, image: Image.Image) -> bytes:
+        mode: bytes = image.mode.encode('ascii')
+        return KEYFRAME.pack(*image.size, len(mode)) + mode + compress(self._codec, image.tobytes())
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(writer, self._queue_size)
+        self._clients.add(client)
+        sender: asyncio.Task = asyncio.create_task(self._send_to_client(client))
+
+        try:
+            await self._send_keyframes()
+
+            while True:
+                # Clients only ever send RESYNC, so anything longer is dropped before it is read.
+                type_, _, _, payload = await read_message(reader, RESYNC.size)
+                if type_ == MessageType.RESYNC:
+                    self._log.info('%s client asked to resync after %d', self._label, RESYNC.unpack(payload)[0])
+                    client.needs_keyframe = True
+                    await self._send_keyframes()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, struct.error):
+            pass
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _send_to_client(client: _Client):
+        try:
+            while True:
+                client.writer.write(await client.queue.get())
+                await client.writer.drain()
+        except ConnectionError:
+            client.writer.close()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import asyncio
+import io
+from typing import BinaryIO
+from PIL import Image
+from arbies.drawing.geometry import Box
+from arbies.manager import Manager
+from arbies.trays import Tray
+
+
+class StreamTray(Tray):
+    _boundary: str = 'arbiesframe'
+
+    def __init__(self, manager: Manager, **kwargs):
+        super().__init__(manager, **kwargs)
+
+        self._quality: int = int(kwargs.get('Quality', 80))
+        path: str | None = kwargs.get('Path', None)
+        self._path: str | None = manager.resolve_path(path) if path is not None else None
+        self._host: str = kwargs.get('Host', '127.0.0.1')
+        self._port: int | None = int(kwargs['Port']) if 'Port' in kwargs else None
+
+        self._file: BinaryIO | None = None
+        self._server: asyncio.Server | None = None
+        self._closing: bool = False
+
+        # Only the latest frame is kept, both as an image for on demand PNG snapshots and as an encoded JPEG.
+        self._image: Image.Image | None = None
+        self._frame: bytes | None = None
+        self._frame_index: int = 0
+        self._frame_condition: asyncio.Condition = asyncio.Condition()
+
+    async def startup(self):
+        if self._path is not None:
+            self._file = open(self._path, 'ab')
+
+        if self._port is not None:
+            self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+            self._log.info('%s serving MJPEG on http://%s:%s/stream', self._label, self._host, self._port)
+
+    async def shutdown(self):
+        self._closing = True
+
+        async with self._frame_condition:
+            self._frame_condition.notify_all()
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
+        # Nothing changed, so there is nothing worth encoding.
+        if updated_boxes is not None and len(updated_boxes) == 0:
+            return
+
+        frame: bytes = await asyncio.to_thread(self._encode, image, 'JPEG')
+        if self._server is not None:
+            self._image = image.copy()
+
+        if self._file is not None:
+            await asyncio.to_thread(self._write, frame)
+
+        async with self._frame_condition:
+            self._frame = frame
+            self._frame_index += 1
+            self._frame_condition.notify_all()
+
+    def _encode(self, image: Image.Image, format_: str) -> bytes:
+        stream = io.BytesIO()
+
+        if format_ == 'JPEG':
+            target = image if image.mode in ('L', 'RGB') else image.convert('RGB')
+            target.save(stream, format_, quality=self._quality)
+        else:
+            image.save(stream, format_, compress_level=1)
+
+        return stream.getvalue()
+
+    def _write(self, frame: bytes):
+        self._file.write(frame)
+        self._file.flush()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line: bytes = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            tokens = request_line.decode('latin-1').split()
+            path: str = tokens[1] if len(tokens) >= 2 else '/'
+
+            if path in ('/', '/stream'):
+                await self._send_stream(writer)
+            elif path == '/frame.jpg' and self._frame is not None:
+                await self._send_response(writer, 'image/jpeg', self._frame)
+            elif path == '/frame.png' and self._image is not None:
+                content: bytes = await asyncio.to_thread(self._encode, self._image, 'PNG')
+                await self._send_response(writer, 'image/png', content)
+            else:
+                writer.write(b'HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send_response(writer: asyncio.StreamWriter, content_type: str, content: bytes):
+        writer.write(f'HTTP/1.0 200 OK\r\n'
+                     f'Content-Type: {content_type}\r\n'
+                     f'Content-Length: {len(content)}\r\n\r\n'.encode('latin-1'))
+        writer.write(content)
+        await writer.drain()
+
+    async def _send_stream(self, writer: asyncio.StreamWriter):
+        writer.write(f'HTTP/1.0 200 OK\r\n'
+                     f'Cache-Control: no-cache\r\n'
+                     f'Content-Type: multipart/x-mixed-replace; boundary={self._boundary}\r\n\r\n'.encode('latin-1'))
+
+        sent_index: int = -1
+
+        while not self._closing:
+            async with self._frame_condition:
+                await self._frame_condition.wait_for(
+                    lambda: self._closing or (self._frame is not None and self._frame_index != sent_index))
+                frame, sent_index = self._frame, self._frame_index
+
+            if self._closing:
+                break
+
+            writer.write(f'--{self._boundary}\r\n'
+                         f'Content-Type: image/jpeg\r\n'
+                         f'Content-Length: {len(frame)}\r\n\r\n'.encode('latin-1'))
+            writer.write(frame)
+            writer.write(b'\r\n')
+            await writer.drain()
@@ -12,42 +12,73 @@ class TkTray(Tray):
     def __init__(self, manager: Manager, **kwargs):
         super().__init__(manager, **kwargs)
 
+        # How long to go without pumping Tk events when nothing has been damaged, in seconds.
+        self._idle_interval: float = float(kwargs.get('IdleInterval', 0.2))
+
         self._window: tkinter.Tk | None = None
         self._canvas: tkinter.Canvas | None = None
-        self._image = None
+        self._photo: ImageTk.PhotoImage | None = None
+        self._photo_mode: str | None = None
+        self._damaged: asyncio.Event = asyncio.Event()
         self._loop_task: asyncio.Task | None = None
 
     async def startup(self):
         self._window = tkinter.Tk()
         self._window.bind('<KeyPress>', self._key_press)
         self._window.geometry(f'{self.size.x}x{self.size.y}')
-        self._canvas = tkinter.Canvas(self._window, width=self.size.x, height=self.size.y)
+        self._canvas = tkinter.Canvas(self._window, width=self.size.x, height=self.size.y, highlightthickness=0)
         self._canvas.pack()
         self._loop_task = asyncio.create_task(self._update_loop())
 
     async def shutdown(self):
         if self._loop_task is not None:
+            self._loop_task.cancel()
             await self._loop_task
 
     async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
-        self._image = ImageTk.PhotoImage(image)
-        self._canvas.create_image(0, 0, image=self._image, anchor=tkinter.NW)
+        if self._window is None:
+            return
+
+        if self._photo is None or self._photo_mode != image.mode:
+            # One PhotoImage and one canvas item live for the whole session, and are only ever painted into.
+            self._photo = ImageTk.PhotoImage(image)
+            self._photo_mode = image.mode
+            self._canvas.delete(tkinter.ALL)
+            self._canvas.create_image(0, 0, image=self._photo, anchor=tkinter.NW)
+        elif updated_boxes is None:
+            self._photo.paste(image)
+        else:
+            for box in updated_boxes:
+                self._paste_region(image, box)
+
+        self._damaged.set()
+
+    def _paste_region(self, image: Image.Image, box: Box):
+        # PhotoImage.paste() only takes whole images, so each region goes through a small patch copied in by Tk.
+        patch = ImageTk.PhotoImage(image.crop(box))
+        self._photo.tk.call(str(self._photo), 'copy', str(patch), '-to', box.x, box.y)
 
     async def _update_loop(self):
         try:
             while True:
+                try:
+                    # Wake straight away to show new damage, otherwise only often enough to stay responsive.
+                    await asyncio.wait_for(self._damaged.wait(), self._idle_interval)
+                except TimeoutError:
+                    pass
+
+                self._damaged.clear()
                 self._window.update_idletasks()
                 self._window.update()
-                await asyncio.sleep(0.2)
         except CancelledError:
             pass
         finally:
             self._canvas.destroy()
             self._window.destroy()
-            del self._image
+            self._photo = None
+            self._window = None
             self._loop_task = None
 
     def _key_press(self, event):
         if event.keysym == 'Escape' or event.keysym == 'space':
-            self._loop_task.cancel()
             asyncio.create_task(self._manager.shutdown())
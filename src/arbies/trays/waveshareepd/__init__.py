@@ -1,9 +1,11 @@
 from __future__ import annotations
+import asyncio
 from PIL import Image
 from arbies.drawing.geometry import Box
 from arbies.manager import Manager, ConfigDict
 from arbies.trays import Tray
 from arbies.trays.waveshareepd.device import Device, DeviceConfig
+from arbies.trays.waveshareepd.transport import Transport, HardwareTransport, SimulatedTransport
 
 
 class WaveShareEPDTray(Tray):
@@ -17,15 +19,45 @@ class WaveShareEPDTray(Tray):
             rst_pin=int(kwargs.get('RstPin', DeviceConfig.rst_pin)),
             dc_pin=int(kwargs.get('DcPin', DeviceConfig.dc_pin)),
             cs_pin=int(kwargs.get('CsPin', DeviceConfig.cs_pin)),
-            busy_pin=int(kwargs.get('BusyPin', DeviceConfig.busy_pin)))
+            busy_pin=int(kwargs.get('BusyPin', DeviceConfig.busy_pin)),
+            reset_delay_ms=float(kwargs.get('ResetDelay', DeviceConfig.reset_delay_ms)),
+            refresh_delay_ms=float(kwargs.get('RefreshDelay', DeviceConfig.refresh_delay_ms)))
+
+        self._spi_speed: int = int(kwargs.get('SpiSpeed', 2000000))
+        self._simulated: bool = bool(kwargs.get('Simulated', False))
+        self._simulated_refresh_time: float = float(kwargs.get('SimulatedRefreshTime', 4000.0))
+        self._simulated_real_time: bool = bool(kwargs.get('SimulatedRealTime', False))
+        simulated_path: str | None = kwargs.get('SimulatedPath', None)
+        self._simulated_path: str | None = manager.resolve_path(simulated_path) if simulated_path is not None else None
 
     async def startup(self):
-        self._device = Device(self._device_config)
-        self._device.init()
+        transport: Transport
+        if self._simulated:
+            transport = SimulatedTransport(spi_speed_hz=self._spi_speed,
+                                           refresh_ms=self._simulated_refresh_time,
+                                           real_time=self._simulated_real_time)
+        else:
+            transport = HardwareTransport(spi_speed_hz=self._spi_speed)
+
+        self._device = Device(self._device_config, transport)
+        # The device blocks on BUSY for whole refreshes, so it's driven from a worker thread to keep the loop free.
+        await asyncio.to_thread(self._device.init)
+
+    async def shutdown(self):
+        if self._device is not None and isinstance(self._device.transport, SimulatedTransport):
+            stats = self._device.transport.stats
+            self._log.info('%s simulated %d bytes, %d refreshes, %.3fs on device',
+                           self._label, stats.bytes_transferred, stats.refreshes, stats.elapsed)
+
+        if self._device is not None:
+            self._device.transport.close()
 
     def clear(self):
         self._device.try_locked(self._device.clear)
 
     async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
         self._image = image
-        self._device.try_locked(lambda: self._device.display(self._image))
+        await asyncio.to_thread(self._device.try_locked, lambda: self._device.display(self._image))
+
+        if self._simulated_path is not None and isinstance(self._device.transport, SimulatedTransport):
+            self._device.transport.panel_image().save(self._simulated_path)
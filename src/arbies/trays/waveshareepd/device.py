@@ -1,10 +1,8 @@
 from dataclasses import dataclass
-import time
 from threading import Lock
 from typing import Callable, List, Sequence
 from PIL import Image
-import spidev
-import RPi.GPIO as GPIO
+from arbies.trays.waveshareepd.transport import Transport, HardwareTransport
 
 
 @dataclass(frozen=True)
@@ -15,6 +13,8 @@ class DeviceConfig:
     dc_pin: int = 25
     cs_pin: int = 8
     busy_pin: int = 24
+    reset_delay_ms: float = 200.0
+    refresh_delay_ms: float = 100.0
 
 
 class Device:
@@ -34,17 +34,21 @@ class Device:
 
     _SEND_DATA_CHUNK_LENGTH = 4096
 
-    def __init__(self, config: DeviceConfig):
+    def __init__(self, config: DeviceConfig, transport: Transport | None = None):
         self._config = config
-        self._spi = spidev.SpiDev(0, 0)
+        self._transport: Transport = transport if transport is not None else HardwareTransport()
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
 
     def reset(self):
-        self._digital_write(self._config.rst_pin, GPIO.HIGH)
-        self._delay_ms(200)
-        self._digital_write(self._config.rst_pin, GPIO.LOW)
-        self._delay_ms(200)
-        self._digital_write(self._config.rst_pin, GPIO.HIGH)
-        self._delay_ms(200)
+        self._digital_write(self._config.rst_pin, Transport.HIGH)
+        self._delay_ms(self._config.reset_delay_ms)
+        self._digital_write(self._config.rst_pin, Transport.LOW)
+        self._delay_ms(self._config.reset_delay_ms)
+        self._digital_write(self._config.rst_pin, Transport.HIGH)
+        self._delay_ms(self._config.reset_delay_ms)
 
     def init(self):
         self._module_init()
@@ -89,7 +93,7 @@ class Device:
         self._send_data(buffer)
 
         self._send_command(self._DISPLAY_REFRESH)
-        self._delay_ms(100)
+        self._delay_ms(self._config.refresh_delay_ms)
         self._wait_until_idle()
 
     def _get_buffer(self, image: Image.Image) -> List[int]:
@@ -108,40 +112,29 @@ class Device:
         return buffer
 
     def _wait_until_idle(self):
-        while self._digital_read(self._config.busy_pin) == 0:
-            self._delay_ms(100)
+        self._transport.wait_until_high(self._config.busy_pin)
 
     def _send_command(self, command: int):
-        self._digital_write(self._config.dc_pin, GPIO.LOW)
-        self._spi.writebytes([command])
+        self._digital_write(self._config.dc_pin, Transport.LOW)
+        self._transport.spi_write([command])
 
     def _send_data(self, data: Sequence[int]):
-        self._digital_write(self._config.dc_pin, GPIO.HIGH)
+        self._digital_write(self._config.dc_pin, Transport.HIGH)
 
         for i in range(0, len(data), self._SEND_DATA_CHUNK_LENGTH):
-            self._spi.writebytes(data[i:i + self._SEND_DATA_CHUNK_LENGTH])
+            self._transport.spi_write(data[i:i + self._SEND_DATA_CHUNK_LENGTH])
 
-    @staticmethod
-    def _digital_write(pin: int, value: int):
-        GPIO.output(pin, value)
+    def _digital_write(self, pin: int, value: int):
+        self._transport.digital_write(pin, value)
 
-    @staticmethod
-    def _digital_read(pin: int):
-        return GPIO.input(pin)
+    def _digital_read(self, pin: int):
+        return self._transport.digital_read(pin)
 
-    @staticmethod
-    def _delay_ms(delay: float):
-        time.sleep(delay / 1000.0)
+    def _delay_ms(self, delay: float):
+        self._transport.delay_ms(delay)
 
     def _module_init(self):
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        GPIO.setup(self._config.rst_pin, GPIO.OUT)
-        GPIO.setup(self._config.dc_pin, GPIO.OUT)
-        GPIO.setup(self._config.cs_pin, GPIO.OUT)
-        GPIO.setup(self._config.busy_pin, GPIO.IN)
-        self._spi.max_speed_hz = 2000000
-        self._spi.mode = 0b00
+        self._transport.setup(self._config)
 
     _lock = Lock()
 
@@ -0,0 +1,213 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import threading
+import time
+from typing import TYPE_CHECKING, Sequence
+from PIL import Image
+
+if TYPE_CHECKING:
+    from arbies.trays.waveshareepd.device import DeviceConfig
+
+
+class Transport(ABC):
+    HIGH: int = 1
+    LOW: int = 0
+
+    @abstractmethod
+    def setup(self, config: DeviceConfig):
+        pass
+
+    @abstractmethod
+    def digital_write(self, pin: int, value: int):
+        pass
+
+    @abstractmethod
+    def digital_read(self, pin: int) -> int:
+        pass
+
+    @abstractmethod
+    def spi_write(self, data: Sequence[int]):
+        pass
+
+    # Below this, sleeping would overshoot by more than the delay itself, so spin instead.
+    _spin_threshold_ms: float = 2.0
+    _poll_interval_ms: float = 10.0
+
+    def delay_ms(self, delay: float):
+        if delay >= self._spin_threshold_ms:
+            time.sleep(delay / 1000.0)
+            return
+
+        end: float = time.perf_counter() + delay / 1000.0
+        while time.perf_counter() < end:
+            pass
+
+    def wait_until_high(self, pin: int):
+        while self.digital_read(pin) == self.LOW:
+            self.delay_ms(self._poll_interval_ms)
+
+    def close(self):
+        pass
+
+
+class HardwareTransport(Transport):
+    def __init__(self, spi_speed_hz: int = 2000000):
+        import spidev
+        import RPi.GPIO as GPIO
+
+        self._gpio = GPIO
+        self._spi = spidev.SpiDev(0, 0)
+        self._spi_speed_hz: int = spi_speed_hz
+
+        # Set from the GPIO library's interrupt thread on each rising BUSY edge.
+        self._busy_pin: int | None = None
+        self._busy_edge = threading.Event()
+
+    def setup(self, config: DeviceConfig):
+        GPIO = self._gpio
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        GPIO.setup(config.rst_pin, GPIO.OUT)
+        GPIO.setup(config.dc_pin, GPIO.OUT)
+        GPIO.setup(config.cs_pin, GPIO.OUT)
+        GPIO.setup(config.busy_pin, GPIO.IN)
+        self._spi.max_speed_hz = self._spi_speed_hz
+        self._spi.mode = 0b00
+
+        try:
+            GPIO.add_event_detect(config.busy_pin, GPIO.RISING, callback=lambda _: self._busy_edge.set())
+            self._busy_pin = config.busy_pin
+        except RuntimeError:
+            # Edge detection isn't available everywhere, in which case waits fall back to polling.
+            self._busy_pin = None
+
+    def wait_until_high(self, pin: int):
+        if pin != self._busy_pin:
+            super().wait_until_high(pin)
+            return
+
+        # Clear before checking, so an edge landing between the check and the wait is not lost.
+        self._busy_edge.clear()
+        while self.digital_read(pin) == self.LOW:
+            # The timeout only guards against a missed edge.
+            self._busy_edge.wait(1.0)
+            self._busy_edge.clear()
+
+    def close(self):
+        if self._busy_pin is not None:
+            self._gpio.remove_event_detect(self._busy_pin)
+            self._busy_pin = None
+
+    def digital_write(self, pin: int, value: int):
+        self._gpio.output(pin, value)
+
+    def digital_read(self, pin: int) -> int:
+        return self._gpio.input(pin)
+
+    def spi_write(self, data: Sequence[int]):
+        self._spi.writebytes(data)
+
+
+@dataclass
+class TransportStats:
+    bytes_transferred: int = 0
+    commands: int = 0
+    refreshes: int = 0
+    busy_reads: int = 0
+    # Modelled time spent on the bus, in delays and waiting on BUSY, in seconds.
+    elapsed: float = 0.0
+
+
+class SimulatedTransport(Transport):
+    # Panel commands the model needs to understand. Everything else is only counted.
+    _POWER_ON = 0x04
+    _DATA_START_TRANSMISSION_1 = 0x10
+    _DISPLAY_REFRESH = 0x12
+
+    def __init__(self,
+                 spi_speed_hz: int = 2000000,
+                 refresh_ms: float = 4000.0,
+                 power_on_ms: float = 100.0,
+                 real_time: bool = False):
+        self.stats = TransportStats()
+
+        self._spi_speed_hz: int = spi_speed_hz
+        self._refresh_ms: float = refresh_ms
+        self._power_on_ms: float = power_on_ms
+        self._real_time: bool = real_time
+
+        self._config: DeviceConfig | None = None
+        self._pins: dict[int, int] = {}
+        self._command: int | None = None
+        self._data: bytearray = bytearray()
+        self._panel_data: bytes = b''
+        self._busy_until: float = 0.0
+
+    def setup(self, config: DeviceConfig):
+        self._config = config
+        self._pins = {config.rst_pin: self.HIGH, config.dc_pin: self.LOW, config.cs_pin: self.HIGH}
+
+    def digital_write(self, pin: int, value: int):
+        self._pins[pin] = value
+
+    def digital_read(self, pin: int) -> int:
+        if pin != self._config.busy_pin:
+            return self._pins.get(pin, self.LOW)
+
+        # The panel holds BUSY low while it works.
+        self.stats.busy_reads += 1
+        return self.LOW if self.stats.elapsed < self._busy_until else self.HIGH
+
+    def spi_write(self, data: Sequence[int]):
+        self.stats.bytes_transferred += len(data)
+        self._advance(len(data) * 8 / self._spi_speed_hz)
+
+        if self._pins.get(self._config.dc_pin, self.LOW) == self.LOW:
+            for command in data:
+                self._on_command(command)
+        elif self._command == self._DATA_START_TRANSMISSION_1:
+            self._data.extend(data)
+
+    def delay_ms(self, delay: float):
+        self._advance(delay / 1000.0)
+
+    def wait_until_high(self, pin: int):
+        if pin != self._config.busy_pin:
+            super().wait_until_high(pin)
+            return
+
+        # Models waking on the edge, rather than at the next poll after it.
+        self.stats.busy_reads += 1
+        self._advance(max(0.0, self._busy_until - self.stats.elapsed))
+
+    def panel_image(self) -> Image.Image:
+        width, height = self._config.width, self._config.height
+        image = Image.new('L', (width, height), 255)
+
+        # Two pixels per byte, one per nibble, where 0x3 is white.
+        pixels = bytearray(width * height)
+        for i, value in enumerate(self._panel_data[:len(pixels) // 2]):
+            pixels[i * 2] = 255 if value & 0xf0 == 0x30 else 0
+            pixels[i * 2 + 1] = 255 if value & 0x0f == 0x03 else 0
+        image.frombytes(bytes(pixels))
+
+        return image
+
+    def _on_command(self, command: int):
+        self.stats.commands += 1
+        self._command = command
+
+        if command == self._DATA_START_TRANSMISSION_1:
+            self._data = bytearray()
+        elif command == self._DISPLAY_REFRESH:
+            self.stats.refreshes += 1
+            self._panel_data = bytes(self._data)
+            self._busy_until = self.stats.elapsed + self._refresh_ms / 1000.0
+        elif command == self._POWER_ON:
+            self._busy_until = self.stats.elapsed + self._power_on_ms / 1000.0
+
+    def _advance(self, seconds: float):
+        self.stats.elapsed += seconds
+        if self._real_time:
+            time.sleep(seconds)
@@ -3,31 +3,85 @@ from PIL import Image
 from arbies.drawing.geometry import Box
 from arbies.manager import Manager
 from arbies.trays import Tray
+from arbies.trays.damage import DamageConfig
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from IT8951.display import AutoEPDDisplay
+    from arbies.trays.waveshareit8951hat.simulated import SimulatedEPDDisplay
 
 
 class WaveShareIT8951HATTray(Tray):
     _loop_interval = 60 * 60 * 24
+    # 4bpp area loads must start and end on 4 pixel boundaries, and every display command carries a fixed waveform
+    # cost, so a few larger regions beat many small ones.
+    _default_damage_config: DamageConfig = DamageConfig(x_alignment=4, update_overhead=200000, max_regions=4)
 
     def __init__(self, manager: Manager, **kwargs):
         super().__init__(manager, **kwargs)
 
-        self._device: AutoEPDDisplay | None = None
+        self._device: AutoEPDDisplay | SimulatedEPDDisplay | None = None
         self._vcom: float = float(kwargs.get('Vcom', -1.0))
+        self._gc16: int | None = None
+
+        self._spi_speed: int | None = int(kwargs['SpiSpeed']) if 'SpiSpeed' in kwargs else None
+        self._simulated: bool = bool(kwargs.get('Simulated', False))
+        self._simulated_real_time: bool = bool(kwargs.get('SimulatedRealTime', False))
+        simulated_path: str | None = kwargs.get('SimulatedPath', None)
+        self._simulated_path: str | None = manager.resolve_path(simulated_path) if simulated_path is not None else None
 
     async def startup(self):
-        from IT8951.display import AutoEPDDisplay
+        if self._simulated:
+            from arbies.trays.waveshareit8951hat.simulated import SimulatedEPDDisplay, DisplayModes
 
-        self._device = AutoEPDDisplay(vcom=self._vcom)
-        self._device.clear()
+            self._device = SimulatedEPDDisplay(self.size.x, self.size.y,
+                                               spi_hz=self._spi_speed or 24000000,
+                                               real_time=self._simulated_real_time)
+        else:
+            from IT8951.constants import DisplayModes
+            from IT8951.display import AutoEPDDisplay
 
-    async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
-        from IT8951.constants import DisplayModes
+            if self._spi_speed is not None:
+                self._device = AutoEPDDisplay(vcom=self._vcom, spi_hz=self._spi_speed)
+            else:
+                self._device = AutoEPDDisplay(vcom=self._vcom)
+
+        self._gc16 = DisplayModes.GC16
+
+        # E-paper holds its image without power, so after a restart the panel still shows the last frame pushed. The
+        # manager only restores a frame when nothing was pushed after it was saved, so otherwise the panel is cleared.
+        restored: Image.Image | None = self._manager.restored_frame
+        if restored is None:
+            self._device.clear()
+            return
+
+        if restored.size != self.size:
+            restored = restored.resize(self.size)
+        self._device.frame_buf.paste(restored.convert('L'))
+        self._device.prev_frame = self._device.frame_buf.copy()
+        self._needs_full_frame = False
+        self._log.info('IT8951. Skipped clear, panel holds the restored frame.')
 
+    async def shutdown(self):
+        if self._simulated and self._device is not None:
+            stats = self._device.stats
+            self._log.info('%s simulated %d updates, %d pixels, %d bytes, %.3fs on device',
+                           self._label, stats.updates, stats.pixels, stats.bytes_transferred, stats.elapsed)
+
+    async def _serve_internal(self, image: Image.Image, updated_boxes: list[Box] | None = None):
         self._device.frame_buf.paste(image)
-        self._device.draw_partial(DisplayModes.GC16)
 
-        self._manager.log.info(f'IT8951. Pushed full, 16 level grey, VCOM {self._vcom}.')
+        if updated_boxes is None:
+            self._device.draw_partial(self._gc16)
+            self._log.info('IT8951. Pushed full, 16 level grey, VCOM %s.', self._vcom)
+        else:
+            frame: Image.Image = self._device.frame_buf
+            for box in updated_boxes:
+                self._device.update(frame.crop(box).tobytes(), (box.x, box.y), (box.width, box.height), self._gc16)
+            # Keep the display's own diffing in step with what was pushed region by region.
+            self._device.prev_frame = frame.copy()
+
+            self._log.info('IT8951. Pushed %d regions, 16 level grey, VCOM %s.', len(updated_boxes), self._vcom)
+
+        if self._simulated and self._simulated_path is not None:
+            self._device.panel_image().save(self._simulated_path)
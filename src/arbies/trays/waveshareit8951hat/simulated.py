@@ -0,0 +1,97 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import IntEnum
+import time
+from PIL import Image, ImageChops
+
+
+class DisplayModes(IntEnum):
+    # Mirrors IT8951.constants.DisplayModes, so the tray can run without the IT8951 package.
+    INIT = 0
+    DU = 1
+    GC16 = 2
+    GL16 = 3
+    GLR16 = 4
+    GLD16 = 5
+    A2 = 6
+    DU4 = 7
+
+
+@dataclass
+class DisplayStats:
+    bytes_transferred: int = 0
+    updates: int = 0
+    pixels: int = 0
+    # Modelled time spent loading and refreshing, in seconds.
+    elapsed: float = 0.0
+
+
+class SimulatedEPDDisplay:
+    # Rough waveform durations, in milliseconds.
+    _refresh_ms: dict[int, float] = {
+        DisplayModes.INIT: 2000.0,
+        DisplayModes.DU: 260.0,
+        DisplayModes.GC16: 450.0,
+        DisplayModes.GL16: 450.0,
+        DisplayModes.GLR16: 450.0,
+        DisplayModes.GLD16: 450.0,
+        DisplayModes.A2: 120.0,
+        DisplayModes.DU4: 290.0,
+    }
+    # Command and register writes around every area load and display.
+    _update_overhead_bytes: int = 64
+
+    def __init__(self, width: int, height: int, spi_hz: int = 24000000, real_time: bool = False):
+        self.width: int = width
+        self.height: int = height
+        self.display_dims: tuple[int, int] = (width, height)
+        self.frame_buf: Image.Image = Image.new('L', self.display_dims, 0xff)
+        self.prev_frame: Image.Image | None = None
+        self.stats = DisplayStats()
+
+        self._spi_hz: int = spi_hz
+        self._real_time: bool = real_time
+        self._panel: Image.Image = Image.new('L', self.display_dims, 0xff)
+
+    def panel_image(self) -> Image.Image:
+        return self._panel.copy()
+
+    def clear(self):
+        self.frame_buf.paste(0xff, (0, 0, self.width, self.height))
+        self.draw_full(DisplayModes.INIT)
+
+    def draw_full(self, mode: int):
+        self.update(self.frame_buf.tobytes(), (0, 0), self.display_dims, mode)
+        self.prev_frame = self.frame_buf.copy()
+
+    def draw_partial(self, mode: int):
+        if self.prev_frame is None:
+            self.draw_full(mode)
+            return
+
+        diff_box = ImageChops.difference(self.prev_frame, self.frame_buf).getbbox()
+        if diff_box is None:
+            return
+
+        # Area loads start and end on 4 pixel boundaries, the same as the real driver rounds to.
+        diff_box = (diff_box[0] // 4 * 4, diff_box[1], min(self.width, -(-diff_box[2] // 4) * 4), diff_box[3])
+        region = self.frame_buf.crop(diff_box)
+
+        self.update(region.tobytes(), diff_box[:2], region.size, mode)
+        self.prev_frame = self.frame_buf.copy()
+
+    def update(self, data: bytes, xy: tuple[int, int], dims: tuple[int, int], mode: int):
+        pixels: int = dims[0] * dims[1]
+        # Pixels are packed down to 4 bits on the wire.
+        transferred: int = pixels // 2 + self._update_overhead_bytes
+
+        self.stats.updates += 1
+        self.stats.pixels += pixels
+        self.stats.bytes_transferred += transferred
+
+        seconds: float = transferred * 8 / self._spi_hz + self._refresh_ms.get(mode, 450.0) / 1000.0
+        self.stats.elapsed += seconds
+        if self._real_time:
+            time.sleep(seconds)
+
+        self._panel.paste(Image.frombytes('L', dims, data), xy)
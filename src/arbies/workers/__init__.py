@@ -2,10 +2,11 @@ from __future__ import annotations
 import asyncio
 from abc import ABC
 from collections import defaultdict
-import traceback
+import logging
+import weakref
 from PIL import Image, ImageDraw
 from arbies import import_module_class_from_fullname
-from arbies.drawing import ColorType, as_color
+from arbies.drawing import ColorType, as_mode_color
 from arbies.drawing.font import Font, get_font
 from arbies.drawing.geometry import Vector2, Box
 from arbies.manager import Manager
@@ -42,11 +43,25 @@ class Worker(ABC):
         self.label = f'{name}[{len(Worker._instances[name]) - 1}]'
 
         self._manager: Manager = manager
-        self._position: Vector2 = Vector2(kwargs.get('Position', (0, 0)))
+        self._log: logging.Logger = manager.get_log('Workers')
         self._size: Vector2 = Vector2(kwargs.get('Size', (100, 100)))
-        self._font_fill: ColorType = as_color(kwargs.get('FontFill', (0, 0, 0, 255)))
+        self._position: Vector2 = Vector2()
+        self._box: Box = Box()
+        self.move_to(kwargs.get('Position', (0, 0)))
+        self._font_fill: ColorType = as_mode_color(kwargs.get('FontFill', (0, 0, 0, 255)), manager.canvas_mode)
         font_size: int | None = int(kwargs.get('FontSize')) if 'FontSize' in kwargs else None
         self._font: Font = get_font(kwargs.get('Font', None), size=font_size)
+        # Whether every rendered pixel is fully opaque. Left as None, the manager checks each image's alpha instead.
+        self._opaque: bool | None = bool(kwargs['Opaque']) if 'Opaque' in kwargs else None
+        # Whether the worker's output depends only on the time, so the next frame can be rendered before it is due.
+        self._render_ahead: bool = False
+        self._render_timeout: float = float(kwargs.get('RenderTimeout', manager.render_timeout))
+        # When a render fails, the last good image stays up instead, marked stale once if MarkStale is set.
+        self._mark_stale: bool = bool(kwargs.get('MarkStale', False))
+        self._last_good_image: Image.Image | None = None
+        self._stale: bool = False
+        # Failure and stale images shown in place of a render, keyed by id() as images aren't hashable.
+        self._fallback_images: weakref.WeakValueDictionary[int, Image.Image] = weakref.WeakValueDictionary()
 
     @property
     def manager(self):
@@ -62,10 +77,29 @@ class Worker(ABC):
 
     @property
     def box(self) -> Box:
-        return Box(self._position[0],
-                   self._position[1],
-                   self._position[0] + self._size[0],
-                   self._position[1] + self._size[1])
+        return self._box
+
+    def move_to(self, position: Vector2):
+        # The box is read for every composite, so it is only rebuilt when the worker actually moves.
+        self._position = Vector2(position)
+        self._box = Box(self._position[0],
+                        self._position[1],
+                        self._position[0] + self._size[0],
+                        self._position[1] + self._size[1])
+
+    @property
+    def opaque(self) -> bool | None:
+        return self._opaque
+
+    def get_image_opaque(self, image: Image.Image) -> bool | None:
+        # Only the worker's own renders are as opaque as it declares. Fallbacks, like the failure pattern, may not be.
+        if self._fallback_images.get(id(image), None) is image:
+            return None
+        return self._opaque
+
+    @property
+    def render_ahead(self) -> bool:
+        return self._render_ahead
 
     @property
     def font(self) -> Font:
@@ -75,6 +109,10 @@ class Worker(ABC):
     def font_fill(self) -> ColorType:
         return self._font_fill
 
+    # The supplier types rendering fetches, so the manager can start them before the first frame.
+    def required_suppliers(self) -> list[Type]:
+        return []
+
     async def startup(self):
         pass
 
@@ -85,27 +123,78 @@ class Worker(ABC):
         await self.render_once()
 
     async def render_once(self):
-        image: Image.Image
+        image: Image.Image | None = await self._render()
+        if image is not None:
+            await self._manager.update_worker_image(self, image)
+
+    async def render_fallback(self):
+        # For when a render was cancelled from outside, leaving the worker with nothing new to show.
+        image: Image.Image | None = await self._render_failed()
+        if image is not None:
+            await self._manager.update_worker_image(self, image)
+
+    async def _render(self) -> Image.Image | None:
+        from arbies.asyncutil import CircuitOpenError
 
         try:
-            image = await self._render_internal()
+            image: Image.Image = await asyncio.wait_for(self._render_internal(), self._render_timeout)
+        except TimeoutError:
+            self._log.warning('%s cancelled after %s seconds rendering', self.label, self._render_timeout)
+            return await self._render_failed()
+        except CircuitOpenError as e:
+            self._log.warning('%s not rendered: %s', self.label, e)
+            return await self._render_failed()
         except Exception:
-            image = await self._render_exceptioned()
-            self._manager.log.error(traceback.format_exc())
+            self._log.exception('%s failed to render', self.label)
+            return await self._render_failed()
+
+        self._last_good_image = image
+        self._stale = False
+        return image
+
+    async def _render_failed(self) -> Image.Image | None:
+        # Returns None when what is already showing should be left alone.
+        if self._last_good_image is None:
+            self._last_good_image = self._manager.get_restored_image(self)
 
-        await self._manager.update_worker_image(self, image)
+        if self._last_good_image is None:
+            return self._add_fallback(await self._render_exceptioned())
+
+        if not self._mark_stale or self._stale:
+            return None
+
+        self._stale = True
+        return self._add_fallback(await self._render_stale(self._last_good_image))
+
+    def _add_fallback(self, image: Image.Image) -> Image.Image:
+        self._fallback_images[id(image)] = image
+        return image
 
     async def _render_internal(self) -> Image.Image:
         raise NotImplemented
 
     async def _render_exceptioned(self) -> Image.Image:
-        image = Image.new('RGBA', self._size, 1)
+        mode: str = self._manager.canvas_mode
+        image = self._manager.new_image(self._size)
         draw = ImageDraw.Draw(image)
 
-        draw.rectangle((0, 0, self._size[0], self._size[1]), (200, 200, 0, 128))
+        draw.rectangle((0, 0, self._size[0], self._size[1]), as_mode_color((200, 200, 0, 128), mode))
 
         for x in range(5, max(*self._size) * 2, 10):
-            draw.line(((x, 0), (0, x)), (200, 0, 0), 2)
+            draw.line(((x, 0), (0, x)), as_mode_color((200, 0, 0), mode), 2)
+
+        del draw
+
+        return image
+
+    async def _render_stale(self, image: Image.Image) -> Image.Image:
+        image = image.copy()
+        draw = ImageDraw.Draw(image)
+
+        # A folded corner, small enough to leave the last good content readable.
+        corner: int = max(4, min(*self._size) // 8)
+        draw.polygon(((self._size[0] - corner, 0), (self._size[0] - 1, 0), (self._size[0] - 1, corner - 1)),
+                     self._font_fill)
 
         del draw
 
@@ -119,20 +208,34 @@ class LoopIntervalWorker(Worker):
         self._cron_interval: str = kwargs.get('Interval', '*/1 * * * *')
 
     async def render_loop(self):
-        from datetime import datetime
+        from datetime import datetime, timezone
         from croniter import croniter
+        from arbies.suppliers.datetime_ import DateTimeSupplier
 
-        delay: float = 0.0
         time_next: datetime = datetime.now()
         time_iter: croniter = croniter(self._cron_interval, time_next)
 
-        while True:
-            await self.render_once()
+        await self.render_once()
 
-            now = datetime.now()
-            while time_next <= now or delay <= 0:
+        while True:
+            # Always move past the time last rendered for, as render ahead workers get there before it arrives.
+            after: datetime = max(datetime.now(), time_next)
+            while time_next <= after:
                 time_next = time_iter.next(datetime)
-                delay = (time_next - now).total_seconds()
 
-            self._manager.log.debug(f'Awaiting {self.label} until {time_next} ({delay} seconds)')
+            # Render ahead workers wake early enough to render as of time_next, and have the manager push the
+            # result so the panel finishes refreshing right on time.
+            lead: float = self._manager.render_lead_time if self._render_ahead else 0.0
+            delay: float = max(0.0, (time_next - datetime.now()).total_seconds() - lead)
+
+            self._log.debug('Awaiting %s until %s (%s seconds)', self.label, time_next, delay)
             await asyncio.sleep(delay)
+
+            if not self._render_ahead:
+                await self.render_once()
+                continue
+
+            with DateTimeSupplier.rendering_at(time_next.astimezone(timezone.utc)):
+                image = await self._render()
+            if image is not None:
+                await self._manager.schedule_worker_image(self, image, time_next)
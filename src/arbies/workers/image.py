@@ -13,7 +13,7 @@ class ImageWorker(Worker):
         self._path: str = manager.resolve_path(path)
 
     async def _render_internal(self) -> Image.Image:
-        image = Image.new('RGBA', self._size)
+        image = self._manager.new_image(self._size)
         draw_image(image,
                    Image.open(self._path),
                    resize=True,
@@ -1,9 +1,11 @@
 from __future__ import annotations
-from pathlib import Path
+import asyncio
 from PIL import Image
-from arbies.drawing import get_icon
+from arbies.drawing import draw_image, get_icon
 from arbies.manager import Manager
+from arbies.suppliers.network import NetworkInterfaceSupplier
 from arbies.workers import Worker
+from typing import Type
 
 
 class NetworkStatusWorker(Worker):
@@ -11,16 +13,34 @@ class NetworkStatusWorker(Worker):
         super().__init__(manager, **kwargs)
 
         self._interface: str = kwargs.get('Interface', '')
+        # Set by the supplier when the interface's state changes, as the worker has no interval of its own.
+        self._changed: asyncio.Event = asyncio.Event()
 
-    async def _render_internal(self) -> Image.Image:
-        image = Image.new('RGBA', self._size)
+    def required_suppliers(self) -> list[Type]:
+        return [NetworkInterfaceSupplier]
+
+    async def startup(self):
+        supplier: NetworkInterfaceSupplier = await self._manager.get_supplier(NetworkInterfaceSupplier)
+        supplier.add_on_changed(self._interface, self._on_changed)
+
+    async def shutdown(self):
+        supplier: NetworkInterfaceSupplier = await self._manager.get_supplier(NetworkInterfaceSupplier)
+        supplier.remove_on_changed(self._interface, self._on_changed)
 
-        icon_name: str = 'wifi-off'
-        state_path: Path = Path(f'/sys/class/net/{self._interface}/operstate')
+    async def render_loop(self):
+        while True:
+            self._changed.clear()
+            await self.render_once()
+            await self._changed.wait()
 
-        if state_path.is_file() and state_path.read_bytes() == b'up\n':
-            icon_name = 'wifi'
+    def _on_changed(self, _: str, __: str):
+        self._changed.set()
+
+    async def _render_internal(self) -> Image.Image:
+        supplier: NetworkInterfaceSupplier = await self._manager.get_supplier(NetworkInterfaceSupplier)
+        image = self._manager.new_image(self._size)
 
-        image.paste(get_icon(icon_name, tuple(self._size)))
+        icon_name: str = 'wifi' if supplier.get_state(self._interface) == 'up' else 'wifi-off'
+        draw_image(image, get_icon(icon_name, tuple(self._size)))
 
         return image
@@ -18,7 +18,7 @@ class SlideShowWorker(LoopIntervalWorker):
 
     async def _render_internal(self):
         path: str = next(self._path_iterator)
-        image = Image.new('RGBA', self._size)
+        image = self._manager.new_image(self._size)
         draw_image(image,
                    Image.open(path),
                    resize=True,
@@ -1,6 +1,5 @@
 from __future__ import annotations
-from PIL import Image
-from arbies.drawing import ColorType, as_color
+from arbies.drawing import ColorType, as_color, as_mode_color
 from arbies.manager import Manager
 from arbies.workers import Worker
 
@@ -11,7 +10,10 @@ class SolidRectWorker(Worker):
     def __init__(self, manager: Manager, **kwargs):
         super().__init__(manager, **kwargs)
 
-        self._fill: ColorType = as_color(kwargs.get('Fill', self._default_fill))
+        fill: ColorType = as_color(kwargs.get('Fill', self._default_fill))
+        self._fill: ColorType = as_mode_color(fill, manager.canvas_mode)
+        if self._opaque is None:
+            self._opaque = len(fill) == 3 or fill[3] == 255
 
     async def _render_internal(self):
-        return Image.new('RGBA', self._size, self._fill)
+        return self._manager.new_image(self._size, self._fill)
@@ -14,20 +14,29 @@ if TYPE_CHECKING:
 
 class TextWorker(LoopIntervalWorker):
     _parser_re = re.compile(r"({{|}}|{\w*(?:\.\w+|\[[^]]+])*(?:\|[^}]+)?})")
+    # Templates parsed ahead of time, by a compiled plan.
+    _parsed_cache: dict[str, list[Run]] = {}
 
     def __init__(self, manager: Manager, **kwargs):
         from arbies.workers.text.runs.raw import Raw
 
         super().__init__(manager, **kwargs)
 
-        self._runs: list[Run] = self._parse(kwargs.get('Text', ''))
+        text: str = kwargs.get('Text', '')
+        self._runs: list[Run] = list(TextWorker._parsed_cache[text]) if text in TextWorker._parsed_cache else \
+            self._parse(text)
 
         # If there are no variables, the text can never change, so the worker only needs to render once.
         if all(isinstance(chunk, Raw) for chunk in self._runs):
             self.render_loop = self.render_once
+        else:
+            self._render_ahead = bool(kwargs.get('RenderAhead', True)) and all(run.predictable for run in self._runs)
+
+    def required_suppliers(self) -> list[Type]:
+        return [type_ for run in self._runs for type_ in run.required_suppliers()]
 
     async def _render_internal(self) -> Image.Image:
-        image = Image.new('RGBA', self._size)
+        image = self._manager.new_image(self._size)
         draw = ImageDraw.Draw(image)
 
         text_tasks = [asyncio.create_task(chunk.render(self.manager)) for chunk in self._runs]
@@ -45,6 +54,27 @@ class TextWorker(LoopIntervalWorker):
         del draw
         return image
 
+    @staticmethod
+    def add_parsed(parsed: dict[str, list[Run]]):
+        TextWorker._parsed_cache.update(parsed)
+
+    @staticmethod
+    def clear_parsed():
+        TextWorker._parsed_cache.clear()
+
+    @staticmethod
+    def get_unknown_run_names(value: str) -> list[str]:
+        named_types = TextWorker._get_named_run_types()
+        names: list[str] = []
+
+        for part in TextWorker._parser_re.split(value):
+            if len(part) > 2 and part[0] == '{' and part[-1] == '}' and part not in ('{{', '}}'):
+                name: str = part[1:-1].split('|')[0]
+                if name not in named_types:
+                    names.append(name)
+
+        return names
+
     @staticmethod
     def _parse(value: str) -> list[Run]:
         from arbies.workers.text.runs.raw import Raw
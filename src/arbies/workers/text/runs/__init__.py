@@ -1,12 +1,19 @@
 from abc import ABC
 from arbies.manager import Manager
+from typing import Type
 
 
 class Run(ABC):
     name: str | None = None
+    # Whether the output depends on nothing but the current time.
+    predictable: bool = False
 
     def __init__(self, *params: str):
         pass
 
+    # The supplier types render() fetches, so the manager can start them before the first frame.
+    def required_suppliers(self) -> list[Type]:
+        return []
+
     async def render(self, manager: Manager):
         raise NotImplemented
@@ -1,9 +1,11 @@
 from arbies.manager import Manager
 from arbies.workers.text.runs import Run
+from typing import Type
 
 
 class DateTime(Run):
     name: str | None = 'dt.now'
+    predictable: bool = True
 
     def __init__(self, *params: str):
         super().__init__(*params)
@@ -17,6 +19,12 @@ class DateTime(Run):
             self.location = params[0]
             self.format = '|'.join(params[1:])
 
+    def required_suppliers(self) -> list[Type]:
+        from arbies.suppliers.datetime_ import DateTimeSupplier
+        from arbies.suppliers.location import LocationSupplier
+
+        return [LocationSupplier, DateTimeSupplier]
+
     async def render(self, manager: Manager):
         from arbies.suppliers.datetime_ import DateTimeSupplier
         from arbies.suppliers.location import LocationSupplier
@@ -4,6 +4,7 @@ from arbies.workers.text.runs import Run
 
 class Raw(Run):
     name: str | None = None
+    predictable: bool = True
 
     def __init__(self, *params: str):
         super().__init__(*params)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from arbies.manager import Manager
 from arbies.workers.text.runs.datetime import DateTime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Type
 
 if TYPE_CHECKING:
     from arbies.suppliers.solar import SolarInfo
@@ -10,6 +10,11 @@ if TYPE_CHECKING:
 class _Solar(DateTime):
     name: str | None = None
 
+    def required_suppliers(self) -> list[Type]:
+        from arbies.suppliers.solar import SolarSupplier
+
+        return super().required_suppliers() + [SolarSupplier]
+
     async def render(self, manager: Manager):
         from arbies.suppliers.datetime_ import DateTimeSupplier
         from arbies.suppliers.location import LocationSupplier
@@ -2,7 +2,7 @@ from __future__ import annotations
 from enum import Enum
 from arbies.manager import Manager
 from arbies.workers.text.runs import Run
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Type
 
 if TYPE_CHECKING:
     from arbies.suppliers.weather import WeatherPeriod
@@ -31,6 +31,12 @@ class _Weather(Run):
 
         self.units = Units.METRIC if units.lower() != 'i' else Units.IMPERIAL
 
+    def required_suppliers(self) -> list[Type]:
+        from arbies.suppliers.location import LocationSupplier
+        from arbies.suppliers.weather import WeatherSupplier
+
+        return [LocationSupplier, WeatherSupplier]
+
     async def render(self, manager: Manager):
         from arbies.suppliers.location import LocationSupplier
         from arbies.suppliers.weather import WeatherSupplier
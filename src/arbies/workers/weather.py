@@ -6,7 +6,7 @@ from arbies.manager import Manager
 from arbies.suppliers.location import LocationSupplier, Location
 from arbies.suppliers.weather import WeatherSupplier, WeatherPeriod
 from arbies.workers import LoopIntervalWorker
-from typing import Callable
+from typing import Callable, Type
 
 
 async def _render_temperature(worker: WeatherWorker, draw: ImageDraw.Draw, period: WeatherPeriod):
@@ -77,6 +77,9 @@ class WeatherWorker(LoopIntervalWorker):
         if 'Interval' not in kwargs:
             self._cron_interval = style_interval
 
+    def required_suppliers(self) -> list[Type]:
+        return [LocationSupplier, WeatherSupplier]
+
     async def _render_internal(self) -> Image.Image:
         if self._location is None:
             location_supplier: LocationSupplier = await self.manager.get_supplier(LocationSupplier)
@@ -85,7 +88,7 @@ class WeatherWorker(LoopIntervalWorker):
         weather_supplier: WeatherSupplier = await self.manager.get_supplier(WeatherSupplier)
         period = await weather_supplier.get_current(self._location.coords)
 
-        image = Image.new('RGBA', self._size)
+        image = self._manager.new_image(self._size)
         draw = ImageDraw.Draw(image)
 
         await self._render_func(self, draw, period)
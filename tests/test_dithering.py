@@ -0,0 +1,32 @@
+from PIL import Image, ImageChops, ImageDraw
+import pytest
+from arbies.drawing.dithering import Quantizer
+from arbies.drawing.geometry import Box
+
+
+def _gradient(size: tuple[int, int]) -> Image.Image:
+    image = Image.new('L', size)
+    image.putdata([(x * 255 // size[0] + y * 3) % 256 for y in range(size[1]) for x in range(size[0])])
+    return image.convert('RGBA')
+
+
+@pytest.mark.parametrize('method, levels', [('ordered4', 2), ('ordered9', 2), ('threshold', 2), ('errordiffusion', 2),
+                                            ('none', 2), ('none', 4), ('errordiffusion', 4)])
+def test_partial_updates_match_whole_frame(method, levels):
+    before = _gradient((48, 30))
+    after = before.copy()
+    ImageDraw.Draw(after).rectangle((10, 8, 17, 13), (255, 255, 255, 255))
+
+    quantizer = Quantizer(method, levels)
+    quantizer.apply(before)
+    partial, boxes = quantizer.apply(after, [Box(10, 8, 18, 14)])
+
+    whole, _ = Quantizer(method, levels).apply(after)
+    assert partial.tobytes() == whole.tobytes()
+
+    # Everything that changed is within the boxes reported.
+    unchanged = Quantizer(method, levels).apply(before)[0].convert('L')
+    changed = ImageChops.difference(unchanged, partial.convert('L'))
+    for box in boxes:
+        changed.paste(0, tuple(box))
+    assert changed.getbbox() is None
@@ -0,0 +1,20 @@
+from PIL import Image, ImageDraw
+import pytest
+from arbies.drawing.font import Font, draw_text
+
+
+@pytest.mark.parametrize('xy', [(3, 4), (3.5, 4.25), (10.75, 2.5), (0.4, 7.6)])
+@pytest.mark.parametrize('mode', ['L', '1'])
+@pytest.mark.parametrize('size', [14, 18, 24, 37])
+@pytest.mark.parametrize('text', ['12:34 AVWaT', '-3°C', '-12.5°F', '10 mph', '1.5'])
+def test_draw_text_matches_draw_text_at_rounded_position(xy, mode, size, text):
+    # noinspection PyProtectedMember
+    font = Font.get(Font._default_path, size=size)
+
+    expected = Image.new(mode, (200, 60), 0)
+    ImageDraw.Draw(expected).text((round(xy[0]), round(xy[1])), text, font=font, fill=255)
+
+    actual = Image.new(mode, (200, 60), 0)
+    draw_text(ImageDraw.Draw(actual), xy, text, font, 255)
+
+    assert actual.tobytes() == expected.tobytes()
@@ -0,0 +1,71 @@
+import logging
+import time
+from arbies import logutil
+from arbies.logutil import RateLimitFilter
+
+
+def _record(level: int, msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord('arbies.test', level, __file__, 0, msg, args, None)
+
+
+def test_routine_messages_are_not_rate_limited():
+    rate_limit = RateLimitFilter(60.0)
+
+    assert all(rate_limit.filter(_record(logging.INFO, 'Wrote %s', 'out.png')) for _ in range(3))
+
+
+def test_repeated_warnings_are_counted_and_noted():
+    rate_limit = RateLimitFilter(60.0)
+
+    assert rate_limit.filter(_record(logging.WARNING, '%s not rendered', 'Text[0]'))
+    assert not rate_limit.filter(_record(logging.WARNING, '%s not rendered', 'Text[0]'))
+    assert not rate_limit.filter(_record(logging.WARNING, '%s not rendered', 'Text[0]'))
+    assert rate_limit.filter(_record(logging.WARNING, '%s not rendered', 'Text[1]'))
+
+    # Let the interval pass.
+    rate_limit.interval = 0.01
+    time.sleep(0.02)
+    record = _record(logging.WARNING, '%s not rendered', 'Text[0]')
+    assert rate_limit.filter(record)
+    assert record.getMessage() == 'Text[0] not rendered (2 repeats suppressed)'
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+        self.closed: bool = False
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_handlers_are_shared_until_last_release():
+    handler = logutil.acquire_handler('test-shared', _ListHandler)
+    assert logutil.acquire_handler('test-shared', _ListHandler) is handler
+
+    logutil.release_handler('test-shared')
+    assert not handler.closed
+
+    logutil.release_handler('test-shared')
+    assert handler.closed
+
+
+def test_flush_waits_for_queued_records():
+    log = logging.getLogger('arbies.test.flush')
+    log.addHandler(logutil.queue_handler)
+    handler = logutil.acquire_handler('test-flush', _ListHandler)
+
+    try:
+        for index in range(100):
+            log.error('Record %d', index)
+        logutil.flush()
+
+        assert handler.messages == [f'Record {index}' for index in range(100)]
+    finally:
+        log.removeHandler(logutil.queue_handler)
+        logutil.release_handler('test-flush')
@@ -0,0 +1,128 @@
+import asyncio
+from arbies.manager import Manager
+
+
+async def _fail():
+    raise RuntimeError('Failed on purpose')
+
+
+async def _composite_failed_opaque_worker() -> Manager:
+    manager = Manager(Global={'Size': [40, 40], 'LogLevel': 'CRITICAL'},
+                      Workers={'Below': {'Type': 'SolidRect', 'Size': [40, 40], 'Fill': [0, 0, 255]},
+                               'Above': {'Type': 'SolidRect', 'Size': [20, 20], 'Fill': [255, 0, 0]}})
+    below, above = manager.workers
+    above._render_internal = _fail
+
+    await below.render_once()
+    await above.render_once()
+    manager._composite_workers(manager.image)
+    return manager
+
+
+def test_failed_render_is_not_pasted_as_declared_opaque():
+    manager = asyncio.run(_composite_failed_opaque_worker())
+    _, above = manager.workers
+
+    assert above.opaque
+    # The failure pattern is translucent, so it is composited over the worker beneath rather than punching through it.
+    assert manager.image.getchannel('A').getextrema() == (255, 255)
+
+
+async def _reload_with_error(path: str) -> Manager:
+    manager = Manager(Global={'Size': [40, 40], 'LogLevel': 'ERROR'})
+
+    async def _apply_config(*_):
+        raise OSError('Could not open font')
+
+    manager.apply_config = _apply_config
+    await manager.reload_config(path)
+    return manager
+
+
+def test_reload_errors_are_logged(tmp_path, caplog):
+    config_path = tmp_path / 'arbies.toml'
+    config_path.write_text('[Global]\nSize = [40, 40]\n')
+
+    asyncio.run(_reload_with_error(str(config_path)))
+
+    assert any('Could not apply' in record.getMessage() and record.exc_info is not None for record in caplog.records)
+
+
+async def _shutdown_while_reloading(path: str) -> set[asyncio.Task]:
+    manager = Manager(Global={'Size': [40, 40], 'LogLevel': 'CRITICAL'})
+    reloading = asyncio.Event()
+
+    async def _apply_config(*_):
+        reloading.set()
+        await asyncio.sleep(60)
+
+    manager.apply_config = _apply_config
+    manager._schedule_reload(path)
+    tasks = set(manager._reload_tasks)
+    await reloading.wait()
+    await manager.shutdown()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return tasks
+
+
+def test_shutdown_cancels_reloads(tmp_path):
+    config_path = tmp_path / 'arbies.toml'
+    config_path.write_text('[Global]\nSize = [40, 40]\n')
+
+    tasks = asyncio.run(_shutdown_while_reloading(str(config_path)))
+
+    assert len(tasks) == 1 and all(task.cancelled() for task in tasks)
+
+
+def _font_config(size: int) -> dict:
+    from arbies.drawing.font import Font
+
+    # noinspection PyProtectedMember
+    return {'Body': {'Path': Font._default_path, 'Size': size}}
+
+
+async def _apply_bad_config() -> None:
+    manager = Manager(Global={'Size': [40, 40], 'LogLevel': 'CRITICAL'}, Fonts=_font_config(14),
+                      Workers={'Label': {'Type': 'Text', 'Text': 'Hi', 'Font': 'Body'}})
+
+    try:
+        await manager.apply_config({'Global': {'Size': [40, 40]}, 'Fonts': _font_config(30),
+                                    'Workers': {'Label': {'Type': 'Text', 'Text': 'Hi', 'Font': 'Body'},
+                                                'Broken': {'Type': 'NoSuchType'}}})
+    except (KeyError, ValueError):
+        pass
+    else:
+        raise AssertionError('A config with an unknown Type applied')
+    finally:
+        await manager.shutdown()
+
+
+def test_bad_reload_leaves_fonts_untouched():
+    from arbies.drawing.font import get_font
+
+    asyncio.run(_apply_bad_config())
+
+    assert get_font('Body').size == 14
+
+
+def test_config_replaced_by_rename_is_noticed(tmp_path):
+    from watchdog.events import FileMovedEvent
+    from arbies.suppliers.filesystem import OnModifyObserver
+
+    config_path = str(tmp_path / 'arbies.toml')
+    changed: list[str] = []
+
+    class _Parent:
+        _filename = config_path
+
+        class _throttled_callback:
+            @staticmethod
+            def trigger(path: str):
+                changed.append(path)
+
+    # noinspection PyProtectedMember
+    handler = OnModifyObserver._EventHandler(_Parent())
+    handler.on_moved(FileMovedEvent(str(tmp_path / '.arbies.toml.swp'), config_path))
+    handler.on_moved(FileMovedEvent(config_path, str(tmp_path / 'elsewhere.toml')))
+
+    assert changed == [config_path]
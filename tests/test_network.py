@@ -0,0 +1,74 @@
+import asyncio
+from PIL import Image, ImageDraw
+from arbies.drawing.geometry import Box
+from arbies.manager import Manager
+from arbies.protocol import Codec, MessageType, RESYNC, pack_message, read_message
+from arbies.receiver import Receiver
+from arbies.trays.network import NetworkTray
+
+
+async def _wait_for_sequence(receiver: Receiver, sequence: int):
+    async with asyncio.timeout(5):
+        while receiver.sequence != sequence:
+            await asyncio.sleep(0.01)
+
+
+async def _loopback(tmp_path):
+    manager = Manager(Global={'Size': [64, 32], 'LogLevel': 'WARNING'})
+    tray = NetworkTray(manager, SocketPath=str(tmp_path / 'arbies.sock'), TileSize=16)
+    await tray.startup()
+
+    receiver = Receiver(str(tmp_path / 'frame.png'))
+    reader, writer = await asyncio.open_unix_connection(str(tmp_path / 'arbies.sock'))
+    receiving: asyncio.Task = asyncio.create_task(receiver.run(reader, writer))
+
+    try:
+        frame = Image.new('RGBA', (64, 32), (255, 255, 255, 255))
+        await tray.serve(frame)
+        # noinspection PyProtectedMember
+        await _wait_for_sequence(receiver, tray._sequence)
+        assert receiver.image.tobytes() == frame.tobytes()
+
+        # A delta, touching one tile.
+        frame = frame.copy()
+        ImageDraw.Draw(frame).rectangle((2, 2, 9, 9), (0, 0, 0, 255))
+        await tray.serve(frame, [Box(2, 2, 10, 10)])
+        # noinspection PyProtectedMember
+        await _wait_for_sequence(receiver, tray._sequence)
+        assert receiver.image.tobytes() == frame.tobytes()
+
+        # A delta the receiver never gets, so the next one doesn't follow on from what it holds. It asks to resync,
+        # and is sent a keyframe instead.
+        # noinspection PyProtectedMember
+        tray._sequence += 1
+        frame = frame.copy()
+        ImageDraw.Draw(frame).rectangle((40, 20, 50, 30), (255, 0, 0, 255))
+        await tray.serve(frame, [Box(40, 20, 51, 31)])
+        # noinspection PyProtectedMember
+        await _wait_for_sequence(receiver, tray._sequence)
+        assert receiver.image.tobytes() == frame.tobytes()
+        assert Image.open(tmp_path / 'frame.png').convert('RGBA').tobytes() == frame.tobytes()
+    finally:
+        await tray.shutdown()
+        await receiving
+        await manager.shutdown()
+
+
+def test_tray_to_receiver_over_unix_socket(tmp_path):
+    asyncio.run(_loopback(tmp_path))
+
+
+async def _read_oversized() -> str:
+    reader = asyncio.StreamReader()
+    reader.feed_data(pack_message(MessageType.RESYNC, Codec.NONE, 0, bytes(RESYNC.size + 1)))
+    reader.feed_eof()
+
+    try:
+        await read_message(reader, RESYNC.size)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError('An oversized payload was read')
+
+
+def test_oversized_payload_is_refused():
+    assert 'over the limit' in asyncio.run(_read_oversized())
@@ -0,0 +1,14 @@
+import os
+from arbies.drawing.font import Font
+from arbies.plan import compile_plan
+
+
+def test_font_paths_are_resolved(tmp_path, monkeypatch):
+    # noinspection PyProtectedMember
+    directory, name = os.path.split(Font._default_path)
+    monkeypatch.setenv('ARBIES_FONTS', directory)
+    monkeypatch.chdir(tmp_path)
+
+    plan = compile_plan(str(tmp_path / 'arbies.toml'), {'Fonts': {'Body': {'Path': f'$ARBIES_FONTS/{name}'}}})
+
+    assert plan.fonts['Body'].path == os.path.abspath(os.path.join(directory, name))
@@ -0,0 +1,71 @@
+import asyncio
+from PIL import Image, ImageDraw
+from arbies.drawing.geometry import Box
+from arbies.manager import Manager
+from arbies.trays.waveshareepd import WaveShareEPDTray
+from arbies.trays.waveshareit8951hat import WaveShareIT8951HATTray
+
+
+def _frame(size: tuple[int, int], rectangle: tuple[int, int, int, int]) -> Image.Image:
+    image = Image.new('L', size, 255)
+    ImageDraw.Draw(image).rectangle(rectangle, 0)
+    return image
+
+
+async def _serve_epd() -> None:
+    manager = Manager(Global={'Size': [32, 16], 'LogLevel': 'WARNING'})
+    tray = WaveShareEPDTray(manager, Simulated=True, SimulatedRefreshTime=1000.0)
+    await tray.startup()
+
+    try:
+        # noinspection PyProtectedMember
+        transport = tray._device.transport
+        for refreshes, rectangle in ((1, (2, 2, 9, 9)), (2, (20, 4, 27, 11))):
+            frame = _frame((32, 16), rectangle)
+            await tray.serve(frame)
+
+            assert transport.panel_image().tobytes() == frame.tobytes()
+            assert transport.stats.refreshes == refreshes
+            # Each refresh holds BUSY low for the configured time.
+            assert transport.stats.elapsed >= refreshes * 1.0
+            assert transport.stats.bytes_transferred >= refreshes * 32 * 16 // 2
+    finally:
+        await tray.shutdown()
+        await manager.shutdown()
+
+
+def test_simulated_epd_shows_served_frames():
+    asyncio.run(_serve_epd())
+
+
+async def _serve_it8951() -> None:
+    manager = Manager(Global={'Size': [32, 16], 'LogLevel': 'WARNING'})
+    tray = WaveShareIT8951HATTray(manager, Simulated=True)
+    await tray.startup()
+
+    try:
+        # noinspection PyProtectedMember
+        device = tray._device
+        # Cleared on startup, as there is no restored frame.
+        assert device.stats.updates == 1 and device.stats.pixels == 32 * 16
+
+        frame = _frame((32, 16), (2, 2, 9, 9))
+        await tray.serve(frame)
+        assert device.panel_image().tobytes() == frame.tobytes()
+        assert device.stats.updates == 2
+
+        # Only the damaged region is loaded, widened to 4 pixel boundaries.
+        pixels: int = device.stats.pixels
+        frame = frame.copy()
+        ImageDraw.Draw(frame).rectangle((21, 5, 25, 9), 0)
+        await tray.serve(frame, [Box(21, 5, 26, 10)])
+        assert device.panel_image().tobytes() == frame.tobytes()
+        assert device.stats.updates == 3
+        assert device.stats.pixels - pixels == 8 * 5
+    finally:
+        await tray.shutdown()
+        await manager.shutdown()
+
+
+def test_simulated_it8951_shows_served_frames():
+    asyncio.run(_serve_it8951())
@@ -0,0 +1,49 @@
+import asyncio
+from arbies.manager import Manager
+from arbies.snapshot import SnapshotStore
+
+
+def _config(tmp_path) -> dict:
+    return {'Global': {'Size': [40, 40], 'LogLevel': 'WARNING', 'SnapshotPath': str(tmp_path / 'snapshot')},
+            'Trays': {'File': {'Type': 'File', 'Path': str(tmp_path / 'frame.png')}},
+            'Workers': {'Rect': {'Type': 'SolidRect', 'Size': [20, 20], 'Fill': [255, 0, 0]}}}
+
+
+async def _render_once(tmp_path):
+    manager = Manager(**_config(tmp_path))
+    try:
+        await (await manager.render_once())
+    except asyncio.CancelledError:
+        # Shutting down cancels the render task, including when it shuts itself down.
+        pass
+
+
+async def _render_loop_briefly(tmp_path) -> SnapshotStore:
+    manager = Manager(**_config(tmp_path))
+    manager._render_loop_interval = 0.1
+    render_task = await manager.render_loop()
+
+    async with asyncio.timeout(5):
+        while not (tmp_path / 'frame.png').exists():
+            await asyncio.sleep(0.05)
+
+    # Pushed since the last save, so the saved frame no longer matches the panel.
+    frame, worker_images = SnapshotStore(str(tmp_path / 'snapshot')).load()
+    assert frame is None
+    assert 'Rect' in worker_images
+
+    render_task.cancel()
+    await asyncio.gather(render_task, return_exceptions=True)
+    await manager.shutdown()
+
+
+def test_warm_restart_serves_every_tray_a_first_frame(tmp_path):
+    asyncio.run(_render_once(tmp_path))
+    assert SnapshotStore(str(tmp_path / 'snapshot')).load()[0] is not None
+
+    # Nothing has changed since, so the workers' first renders match what was restored.
+    (tmp_path / 'frame.png').unlink()
+    asyncio.run(_render_loop_briefly(tmp_path))
+
+    # A clean shutdown saves the frame again.
+    assert SnapshotStore(str(tmp_path / 'snapshot')).load()[0] is not None
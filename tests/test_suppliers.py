@@ -0,0 +1,28 @@
+import asyncio
+import threading
+from arbies import suppliers
+from arbies.suppliers import Supplier
+
+
+async def _fetch_twice(fetches: list[str]) -> list[str]:
+    async def fetch() -> str:
+        fetches.append('weather')
+        await asyncio.sleep(0.2)
+        return 'sunny'
+
+    # noinspection PyProtectedMember
+    return await asyncio.gather(Supplier._fetch_shared('weather', fetch), Supplier._fetch_shared('weather', fetch))
+
+
+def test_shared_fetches_are_deduplicated():
+    cache: dict = {}
+    suppliers.set_shared_cache(cache, threading.Lock())
+    fetches: list[str] = []
+
+    try:
+        assert asyncio.run(_fetch_twice(fetches)) == ['sunny', 'sunny']
+    finally:
+        suppliers.set_shared_cache(None)
+
+    assert fetches == ['weather']
+    assert ('claim', 'weather') not in cache